@@ -1,11 +1,13 @@
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Dict,
     Generator,
     List,
     Optional,
+    Tuple,
     TypedDict,
     Union,
     Callable,
@@ -16,7 +18,9 @@ import json
 import ollama
 from ollama import chat
 import requests
+from requests.adapters import HTTPAdapter
 import streamlit as st
+from urllib3.util.retry import Retry
 
 from ..utils import tool_loader
 
@@ -33,6 +37,90 @@ class ProgressResponse(TypedDict, total=False):
 # Get application logger
 logger = get_logger()
 
+# How long the scraped ollama.com model catalog is shared across sessions,
+# in seconds
+MODELS_CACHE_TTL = 3600
+
+# How long the list of installed models is reused across reruns, in seconds.
+# Deleting or pulling a model through OllamaAPI refreshes it right away
+LOCAL_MODELS_CACHE_TTL = 30
+
+# How long a model's details from ollama.show are reused, in seconds
+MODEL_INFO_CACHE_TTL = 600
+
+# Headers sent when scraping the ollama.com model library
+LIBRARY_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Connection": "keep-alive",
+}
+
+# Timeout of each ollama.com request, as (connect, read) seconds
+LIBRARY_TIMEOUT = (3, 5)
+
+# Time budget for fetching the model tags pages of one scrape, in seconds.
+# Pages not requested by then are skipped, so a slow ollama.com can't stall
+# the whole scrape
+TAG_FETCH_DEADLINE = 30
+
+# Maximum number of model tags pages fetched from ollama.com at the same time
+MAX_PARALLEL_TAG_FETCHES = 8
+
+# Display tags derived from a model's name: each entry's tags apply when the
+# lowercased name contains all of its substrings
+NAME_TAGS = (
+    (("llama",), ("llama",)),
+    (("llama", "3"), ("meta",)),
+    (("llama", "2"), ("meta",)),
+    (("codellama",), ("code", "programming", "meta")),
+    (("7b",), ("small",)),
+    (("13b",), ("medium",)),
+    (("70b",), ("large",)),
+    (("code",), ("code", "programming")),
+    (("vision",), ("vision", "multimodal")),
+    (("image",), ("vision", "multimodal")),
+    (("llava",), ("vision", "multimodal")),
+    (("mistral",), ("mistral",)),
+    (("mixtral",), ("mistral", "mixture")),
+    (("phi",), ("microsoft",)),
+    (("gemma",), ("google",)),
+    (("wizard",), ("wizardlm",)),
+    (("wizard", "math"), ("math", "specific")),
+    (("minilm",), ("embedding",)),
+)
+
+# Patterns used to scrape ollama.com, compiled once instead of per model.
+# Links to the models on the library page
+_MODEL_LINK_RE = re.compile(r'href="/library/([^"]+)')
+# A variant row on a model's tags page: model name, tag, display name, hash,
+# size and last updated
+_TAG_ROW_RE = re.compile(
+    r'<div class="flex px-4 py-3">.*?<a class="group" href="/library/([^":]+):([^"]+)".*?<div[^>]*>([^<]+)</div>.*?<span class="font-mono">([^<]+)</span>\s*•\s*([^•]+)•\s*([^<]+)',
+    re.DOTALL,
+)
+# Any tag link on a model's tags page: model name and tag
+_TAG_LINK_RE = re.compile(r'href="/library/([^":]+):([^"]+)"')
+# Variant tags that are not offered for download
+_EXCLUDED_TAG_RE = re.compile(r"text|base|fp|q[45]_[01]")
+
+# Validators and parsed catalog entry of each model's tags page from the
+# last scrape, as (ETag, Last-Modified, entry). Lets the next scrape send a
+# conditional GET and reuse the entry when the server answers 304
+_tags_page_cache: Dict[str, Tuple[Optional[str], Optional[str], Dict[str, Any]]] = {}
+
+# Shared HTTP session for ollama.com, so the library page and every model's
+# tags page reuse pooled keep-alive connections instead of a new TLS
+# handshake per request
+_library_session = requests.Session()
+_library_session.headers.update(LIBRARY_HEADERS)
+_library_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2)
+    ),
+)
+
 
 class OllamaAPI:
     """Class to handle all interactions with the Ollama API"""
@@ -49,17 +137,26 @@ class OllamaAPI:
             return False
 
     @staticmethod
-    def get_local_models() -> List[Dict[str, Any]]:
-        """Get all local models"""
-        models_response = ErrorHandler.try_execute(
-            ollama.list,
+    def get_local_models(use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get all local models
+
+        Args:
+            use_cache: Whether to reuse the list fetched by a recent call
+                instead of asking the server again
+
+        Returns:
+            List of model dictionaries
+        """
+        if not use_cache:
+            _list_local_models.clear()
+
+        models = ErrorHandler.try_execute(
+            _list_local_models,
             error_context="Failed to fetch models",
-            default_return={"models": []},
+            default_return=[],
         )
 
-        # Get the models list
-        models = models_response.get("models", [])
-
         # Convert Model objects to dictionaries and ensure 'name' key exists
         formatted_models = []
         for model in models:
@@ -106,6 +203,8 @@ class OllamaAPI:
                     completed=progress.get("completed", 0),
                     total=progress.get("total", 0),
                 )
+            _list_local_models.clear()
+            _show_model.clear()
         except Exception as e:
             error_msg = f"Error pulling model {model_name}: {str(e)}"
             logger.error(error_msg, exc_info=True)
@@ -114,7 +213,7 @@ class OllamaAPI:
     @staticmethod
     def delete_model(model_name: str) -> bool:
         """Delete a model"""
-        return (
+        deleted = (
             ErrorHandler.try_execute(
                 ollama.delete,
                 model_name,
@@ -123,89 +222,153 @@ class OllamaAPI:
             )
             is not None
         )
+        if deleted:
+            _list_local_models.clear()
+            _show_model.clear()
+        return deleted
 
     @staticmethod
     def get_model_info(model_name: str) -> Dict[str, Any]:
         """Get info about a model"""
         return ErrorHandler.try_execute(
-            ollama.show,
+            _show_model,
             model_name,
             error_context=f"Error getting info for model {model_name}",
             default_return={},
         )
 
     @staticmethod
-    def search_models(query: str) -> List[Dict[str, Any]]:
+    def search_models(query: str, use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Search for models in the Ollama library
 
         Args:
             query: Search query
+            use_cache: Whether to search the catalog scraped earlier by any
+                session instead of fetching it again
 
         Returns:
             List of model dictionaries
         """
-        return OllamaAPI._fetch_models_from_web(query)
+        if not use_cache:
+            _scrape_ollama_library.clear()
+
+        models_data = _scrape_ollama_library()
+        if not models_data:
+            # Don't keep a failed scrape around for the whole TTL
+            _scrape_ollama_library.clear()
+        return OllamaAPI._filter_models(models_data, query)
 
     @staticmethod
-    def _fetch_models_from_web(query: str) -> List[Dict[str, Any]]:
-        """Fetch models from ollama.com library"""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Connection": "keep-alive",
-        }
+    def _filter_models(
+        models_data: List[Dict[str, Any]], query: str
+    ) -> List[Dict[str, Any]]:
+        """Filter catalog models whose name or tags contain the query"""
+        # Tags are always built lowercase, so only the name needs lowering
+        query_lower = query.lower().strip()
+        return [
+            model
+            for model in models_data
+            if query_lower in model["name"].lower() or query_lower in model["tags"]
+        ]
 
+    @staticmethod
+    def _fetch_tags_page(name: str, deadline: float) -> Optional[requests.Response]:
+        """
+        Fetch the tags page of a model in the ollama.com library
+
+        Args:
+            name: Name of the model
+            deadline: time.monotonic() value after which the page is skipped
+
+        Returns:
+            The response, or None if the deadline had already passed
+        """
+        if time.monotonic() > deadline:
+            return None
+
+        logger.info(f"Fetching tags for {name}...")
+        headers = {}
+        if name in _tags_page_cache:
+            etag, last_modified, _ = _tags_page_cache[name]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        return _library_session.get(
+            f"https://ollama.com/library/{name}/tags",
+            headers=headers,
+            timeout=LIBRARY_TIMEOUT,
+        )
+
+    @staticmethod
+    def _fetch_models_from_web() -> List[Dict[str, Any]]:
+        """Fetch the full model catalog from the ollama.com library"""
         logger.info("Fetching models from ollama.com/library...")
-        models_response = requests.get(
-            "https://ollama.com/library", headers=headers, timeout=10
+        models_response = _library_session.get(
+            "https://ollama.com/library", timeout=LIBRARY_TIMEOUT
         )
         logger.info("Initial response status: %s", models_response.status_code)
 
         if models_response.status_code == 200:
-            model_links = re.findall(r'href="/library/([^"]+)', models_response.text)
+            model_links = _MODEL_LINK_RE.findall(models_response.text)
             logger.info("Found %d model links", len(model_links))
 
             if model_links:
                 model_names = [link for link in model_links if link]
                 logger.info(f"Processing models: {model_names}")
 
+                # Each tags page is an independent round-trip, so fetch them
+                # concurrently; the pages are parsed below in catalog order
+                deadline = time.monotonic() + TAG_FETCH_DEADLINE
+                with ThreadPoolExecutor(
+                    max_workers=min(len(model_names), MAX_PARALLEL_TAG_FETCHES)
+                ) as executor:
+                    tag_pages = [
+                        executor.submit(OllamaAPI._fetch_tags_page, name, deadline)
+                        for name in model_names
+                    ]
+
                 models_data = []
-                for name in model_names:
+                for name, tag_page in zip(model_names, tag_pages):
                     try:
-                        logger.info(f"Fetching tags for {name}...")
-                        tags_response = requests.get(
-                            f"https://ollama.com/library/{name}/tags",
-                            headers=headers,
-                            timeout=10,
-                        )
+                        tags_response = tag_page.result()
+                        if tags_response is None:
+                            logger.warning(
+                                "Skipped tags for %s: fetch deadline passed", name
+                            )
+                            # Fall back to what the last scrape found, if any
+                            if name in _tags_page_cache:
+                                models_data.append(_tags_page_cache[name][2])
+                            continue
+
                         logger.info(
                             "Tags response status for %s: %s",
                             name,
                             tags_response.status_code,
                         )
 
-                        if tags_response.status_code == 200:
-                            # Pattern to extract tag name, hash, size, and last updated information
-                            tag_pattern = (
-                                r'<div class="flex px-4 py-3">.*?<a class="group" href="/library/'
-                                + re.escape(name)
-                                + r':([^"]+)".*?<div[^>]*>([^<]+)</div>.*?<span class="font-mono">([^<]+)</span>\s*•\s*([^•]+)•\s*([^<]+)'
-                            )
-                            tag_matches = re.findall(
-                                tag_pattern, tags_response.text, re.DOTALL
-                            )
-
-                            # Process all variants
+                        if (
+                            tags_response.status_code == 304
+                            and name in _tags_page_cache
+                        ):
+                            # Unchanged since the last scrape, so reuse the
+                            # entry parsed then
+                            models_data.append(_tags_page_cache[name][2])
+                        elif tags_response.status_code == 200:
+                            # Extract tag name, hash, size, and last updated information
+                            tag_matches = _TAG_ROW_RE.findall(tags_response.text)
+
+                            # Process all variants of this model
                             variants = []
                             for tag_match in tag_matches:
-                                if len(tag_match) >= 5:
-                                    tag_name = tag_match[0].strip()
-                                    display_name = tag_match[1].strip()
-                                    hash_value = tag_match[2].strip()
-                                    size = tag_match[3].strip()
-                                    last_updated = tag_match[4].strip()
+                                if tag_match[0] == name:
+                                    tag_name = tag_match[1].strip()
+                                    display_name = tag_match[2].strip()
+                                    hash_value = tag_match[3].strip()
+                                    size = tag_match[4].strip()
+                                    last_updated = tag_match[5].strip()
 
                                     variants.append(
                                         {
@@ -219,16 +382,11 @@ class OllamaAPI:
 
                             # Fallback: If no variants found with detailed regex, use a simpler approach
                             if not variants:
-                                simple_tag_pattern = (
-                                    r'href="/library/' + re.escape(name) + r':([^"]+)"'
-                                )
-                                simple_tags = re.findall(
-                                    simple_tag_pattern, tags_response.text
-                                )
+                                simple_tags = _TAG_LINK_RE.findall(tags_response.text)
 
-                                for tag in simple_tags:
+                                for tag_model, tag in simple_tags:
                                     tag_name = tag.strip()
-                                    if tag_name:
+                                    if tag_model == name and tag_name:
                                         variants.append(
                                             {
                                                 "tag": f"{name}:{tag_name}",
@@ -243,26 +401,11 @@ class OllamaAPI:
                             filtered_variants = [
                                 variant
                                 for variant in variants
-                                if not any(
-                                    x in variant["tag"] for x in ["text", "base", "fp"]
-                                )
-                                and not re.match(r".*q[45]_[01]", variant["tag"])
+                                if not _EXCLUDED_TAG_RE.search(variant["tag"])
                             ]
 
-                            model_type = (
-                                "vision"
-                                if "vision" in name
-                                else "embedding"
-                                if "minilm" in name
-                                else "text"
-                            )
-
                             # Extract tags for display
                             display_tags = OllamaAPI.extract_tags_from_name(name)
-                            if model_type == "vision":
-                                display_tags.extend(["vision", "multimodal"])
-                            elif model_type == "embedding":
-                                display_tags.extend(["embedding"])
 
                             models_data.append(
                                 {
@@ -275,6 +418,16 @@ class OllamaAPI:
                                     "variants": filtered_variants,
                                 }
                             )
+
+                            etag = tags_response.headers.get("ETag")
+                            last_modified = tags_response.headers.get("Last-Modified")
+                            if etag or last_modified:
+                                _tags_page_cache[name] = (
+                                    etag,
+                                    last_modified,
+                                    models_data[-1],
+                                )
+
                             logger.info(
                                 "Successfully processed %s with %d variants",
                                 name,
@@ -287,24 +440,7 @@ class OllamaAPI:
                         continue
 
                 logger.info("Fetched and stored %d models", len(models_data))
-
-                # Cache the models data with current timestamp
-                st.session_state.models_cache = models_data
-                st.session_state.cache_time = time.time()
-                logger.info("Models data cached successfully")
-
-                # Filter models based on the search query
-                results = []
-                query_lower = query.lower().strip()
-
-                for model in models_data:
-                    if (
-                        query_lower in model["name"].lower()
-                        or query_lower in model["tags"].lower()
-                    ):
-                        results.append(model)
-
-                return results
+                return models_data
             else:
                 return []
         else:
@@ -313,51 +449,15 @@ class OllamaAPI:
     @staticmethod
     def extract_tags_from_name(model_name: str) -> List[str]:
         """Extract tags from model name"""
-        tags = []
         model_name = model_name.lower()
 
-        # Extract tags from model name
-        if "llama" in model_name:
-            tags.append("llama")
-            if "3" in model_name:
-                tags.append("meta")
-            elif "2" in model_name:
-                tags.append("meta")
-        if "codellama" in model_name:
-            tags.append("code")
-            tags.append("programming")
-            tags.append("meta")
-        if "7b" in model_name:
-            tags.append("small")
-        if "13b" in model_name:
-            tags.append("medium")
-        if "70b" in model_name:
-            tags.append("large")
-        if "code" in model_name:
-            tags.append("code")
-            tags.append("programming")
-        if "vision" in model_name or "image" in model_name or "llava" in model_name:
-            tags.append("vision")
-            tags.append("multimodal")
-        if "mistral" in model_name:
-            tags.append("mistral")
-        if "mixtral" in model_name:
-            tags.append("mistral")
-            tags.append("mixture")
-        if "phi" in model_name:
-            tags.append("microsoft")
-        if "gemma" in model_name:
-            tags.append("google")
-        if "wizard" in model_name:
-            tags.append("wizardlm")
-            if "math" in model_name:
-                tags.append("math")
-                tags.append("specific")
-            if "coder" in model_name:
-                tags.append("code")
-                tags.append("programming")
-
-        return tags
+        # dict keeps the first occurrence of each tag, in table order
+        tags: Dict[str, None] = {}
+        for substrings, name_tags in NAME_TAGS:
+            if all(substring in model_name for substring in substrings):
+                tags.update(dict.fromkeys(name_tags))
+
+        return list(tags)
 
     @staticmethod
     def chat_completion(
@@ -826,3 +926,45 @@ Here are the available tools:
                     )
 
         return updated_messages
+
+
+@st.cache_data(ttl=LOCAL_MODELS_CACHE_TTL, show_spinner=False)
+def _list_local_models() -> List[Any]:
+    """
+    List the installed models
+
+    Cached so that reruns triggered by widget interactions don't each ask the
+    server again. Errors propagate, so a failed request is never cached.
+
+    Returns:
+        List of models as returned by ollama.list
+    """
+    return list(ollama.list().get("models", []))
+
+
+@st.cache_data(ttl=MODEL_INFO_CACHE_TTL, show_spinner=False)
+def _show_model(model_name: str) -> Any:
+    """
+    Get a model's details, cached per model name
+
+    Args:
+        model_name: Name of the model
+
+    Returns:
+        The response of ollama.show
+    """
+    return ollama.show(model_name)
+
+
+@st.cache_data(ttl=MODELS_CACHE_TTL, show_spinner=False)
+def _scrape_ollama_library() -> List[Dict[str, Any]]:
+    """
+    Scrape the ollama.com model catalog
+
+    Cached per process rather than per session, so one scrape serves every
+    browser tab until the TTL runs out.
+
+    Returns:
+        List of model dictionaries
+    """
+    return OllamaAPI._fetch_models_from_web()
@@ -1,10 +1,6 @@
+import importlib
+
 import streamlit as st
-from .pages.models_page import ModelsPage
-from .pages.chat_page import ChatPage
-from .pages.comparison_page import ComparisonPage
-from .pages.logs_page import LogsPage
-from .pages.tools_page import ToolsPage
-from .pages.agents_page import AgentsPage
 from .utils.logger import get_logger
 
 # Get application logger
@@ -13,6 +9,18 @@ logger = get_logger()
 # Set page configuration
 st.set_page_config(page_title="Ollama UI", page_icon="🤖", layout="wide")
 
+# Pages by sidebar label, as (module, class name). Only the selected page's
+# module is imported, so the other pages' dependencies aren't loaded until
+# they are opened
+PAGES = {
+    "Chat": (".pages.chat_page", "ChatPage"),
+    "Compare Models": (".pages.comparison_page", "ComparisonPage"),
+    "Models": (".pages.models_page", "ModelsPage"),
+    "Tools": (".pages.tools_page", "ToolsPage"),
+    "Agents": (".pages.agents_page", "AgentsPage"),
+    "Logs": (".pages.logs_page", "LogsPage"),
+}
+
 
 # Initialize app state
 def init_app_state():
@@ -33,21 +41,13 @@ def main():
 
     # Sidebar navigation
     st.sidebar.title("Navigation")
-    pages = {
-        "Chat": ChatPage,
-        "Compare Models": ComparisonPage,
-        "Models": ModelsPage,
-        "Tools": ToolsPage,
-        "Agents": AgentsPage,
-        "Logs": LogsPage,
-    }
-
-    for page_name in pages:
+    for page_name in PAGES:
         if st.sidebar.button(page_name, use_container_width=True):
             set_page(page_name)
 
     # Render the selected page
-    page_class = pages[st.session_state.page]
+    module_name, class_name = PAGES[st.session_state.page]
+    page_class = getattr(importlib.import_module(module_name, __package__), class_name)
     page = page_class()
     page.render()
 
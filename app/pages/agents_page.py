@@ -9,6 +9,8 @@ from app.utils.agents.ui_components import (
     render_group_view,
     render_task_executor,
     load_agents,
+    confirm_delete_agent,
+    confirm_delete_group,
 )
 
 # Get application logger
@@ -48,6 +50,9 @@ class AgentsPage:
                 f"Found editing_agent in session state: {st.session_state.editing_agent.name}"
             )
 
+        if "editing_new" not in st.session_state:
+            st.session_state.editing_new = False
+
         try:
             # Load agent data
             logger.info("Loading agent data")
@@ -117,6 +122,7 @@ class AgentsPage:
 
                 st.session_state.selected_group = None
                 st.session_state.editing_agent = None
+                st.session_state.editing_new = False
 
                 logger.info(
                     f"Reset selected_group (was: {previous_group}) and editing_agent (was: {previous_agent}) to None"
@@ -124,16 +130,16 @@ class AgentsPage:
 
             # Main content area
             logger.debug("Rendering main content area")
-            if st.session_state.editing_agent is not None:
+            if st.session_state.editing_agent is not None or st.session_state.editing_new:
                 logger.info(
-                    f"Rendering agent editor for agent: {st.session_state.editing_agent.name}"
+                    f"Rendering agent editor for agent: {getattr(st.session_state.editing_agent, 'name', 'new agent')}"
                 )
                 try:
                     render_agent_editor(
                         st.session_state.editing_agent, st.session_state.selected_group
                     )
                     logger.debug(
-                        f"Successfully rendered agent editor for {st.session_state.editing_agent.name}"
+                        f"Successfully rendered agent editor for {getattr(st.session_state.editing_agent, 'name', 'new agent')}"
                     )
                 except Exception as e:
                     error_msg = log_exception(
@@ -185,12 +191,7 @@ class AgentsPage:
                                         st.session_state.editing_agent_original_group = st.session_state.selected_group
                                 with col2:
                                     if st.button("Delete Agent", key=f"delete_{agent.id}"):
-                                        confirm_delete = st.checkbox("Confirm deletion", key=f"confirm_{agent.id}")
-                                        if confirm_delete:
-                                            st.session_state.selected_group.agents = [a for a in st.session_state.selected_group.agents if a.id != agent.id]
-                                            load_agents()
-                                            st.success(f"Agent {agent.name} deleted!")
-                                            st.rerun()
+                                        confirm_delete_agent(st.session_state.selected_group, agent)
                         
                         # Display shared memory
                         if st.session_state.selected_group.shared_memory:
@@ -206,19 +207,12 @@ class AgentsPage:
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.button("Add New Agent"):
-                                st.session_state.editing_agent = next(
-                                    (a for a in st.session_state.selected_group.agents if not a.name), None
-                                ) or {}
+                                st.session_state.editing_agent = None
+                                st.session_state.editing_new = True
                                 st.rerun()
                         with col2:
                             if st.button("Delete Group"):
-                                confirm_delete = st.checkbox("Confirm group deletion")
-                                if confirm_delete:
-                                    st.session_state.agent_groups = [g for g in st.session_state.agent_groups if g.id != st.session_state.selected_group.id]
-                                    st.session_state.selected_group = None
-                                    load_agents()
-                                    st.success(f"Group {group_name} deleted!")
-                                    st.rerun()
+                                confirm_delete_group(st.session_state.selected_group)
                                     
                         logger.debug(f"Successfully rendered group details for {group_name}")
                     except Exception as e:
@@ -5,7 +5,7 @@ import streamlit as st
 
 from app.api.ollama_api import OllamaAPI
 from app.components.chat_ui import ChatUI
-from app.utils.chat_manager import ChatManager
+from app.utils.chat_manager import ChatManager, flush_pending_chats
 from app.utils.logger import get_logger
 from app.utils.tool_loader import ToolLoader
 
@@ -137,8 +137,10 @@ class ChatPage:
             ):
                 # Tools installed in the tools directory - use function references directly
                 try:
-                    function_tools = ToolLoader.load_all_tools()
-                    available_functions = ToolLoader.load_all_tool_functions()
+                    (
+                        function_tools,
+                        available_functions,
+                    ) = ToolLoader.load_all_tools_and_functions()
                     # Make sure we have the right type
                     if isinstance(function_tools, list):
                         tools = function_tools
@@ -752,14 +754,19 @@ class ChatPage:
         models = OllamaAPI.get_local_models()
         st.session_state.available_models = models
 
-        # Render the sidebar
-        self.render_sidebar()
+        try:
+            # Render the sidebar
+            self.render_sidebar()
 
-        # Display the chat title
-        st.subheader(self.chat_manager.get_current_chat_title())
+            # Display the chat title
+            st.subheader(self.chat_manager.get_current_chat_title())
 
-        # Handle model response if thinking
-        self.handle_model_response()
+            # Handle model response if thinking
+            self.handle_model_response()
 
-        # Render the chat UI with current messages
-        self.chat_ui.render(self.chat_manager.get_messages_for_api())
+            # Render the chat UI with current messages
+            self.chat_ui.render(self.chat_manager.get_messages_for_api())
+        finally:
+            # Write the messages added during this run once, at the end of the
+            # run (also when it ends early with st.rerun)
+            flush_pending_chats()
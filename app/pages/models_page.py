@@ -1,15 +1,95 @@
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import json
-import copy
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-import pandas as pd
 import streamlit as st
 
 from app.api.ollama_api import OllamaAPI
 
+# How often a running download's progress is redrawn, in seconds
+DOWNLOAD_POLL_INTERVAL = 0.5
+
+# Maximum number of models pulled at the same time
+MAX_PARALLEL_PULLS = 3
+
+# Bytes in a gigabyte, as used for model sizes
+BYTES_PER_GB = 1024**3
+
+# Labels and keys of the fields shown under a model's basic information
+BASIC_INFO_FIELDS = (
+    ("Family", "family"),
+    ("Parameter Size", "parameter_size"),
+    ("Quantization Level", "quantization_level"),
+)
+
+# Number of result cards shown per page in the Search tab
+SEARCH_RESULTS_PER_PAGE = 30
+
+# Categories offered by the Search tab's filter
+SEARCH_FILTERS = ("All", "Code", "Vision", "Small", "Medium", "Large")
+
+
+class PullJob:
+    """
+    Models being pulled on a background thread
+
+    The script only polls the job to draw its progress, so the app stays
+    interactive during long pulls. The worker threads write to the job and
+    never touch widgets, which may only be updated from the script thread.
+    """
+
+    def __init__(self, model_names: List[str]):
+        """
+        Start pulling the models
+
+        Args:
+            model_names: Names of the models to pull
+        """
+        self.model_names = model_names
+        self.progress_by_model = {name: 0.0 for name in model_names}
+        self.errors: Dict[str, str] = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        """Whether every pull has finished, successfully or not"""
+        return not self._thread.is_alive()
+
+    @property
+    def percent(self) -> float:
+        """Combined progress of the pulls, between 0 and 1"""
+        return sum(self.progress_by_model.values()) / len(self.model_names)
+
+    def _pull(self, name: str) -> None:
+        """Pull one model, recording its progress"""
+        for progress in OllamaAPI.perform_pull(name):
+            if "error" in progress:
+                self.errors[name] = progress["error"]
+                return
+            total = progress.get("total") or 0
+            if total > 0:
+                self.progress_by_model[name] = progress.get("completed", 0) / total
+        self.progress_by_model[name] = 1.0
+
+    def _run(self) -> None:
+        """Pull all models, several at once since each mostly waits on the network"""
+        with ThreadPoolExecutor(
+            max_workers=min(len(self.model_names), MAX_PARALLEL_PULLS)
+        ) as executor:
+            futures = {
+                executor.submit(self._pull, name): name for name in self.model_names
+            }
+            for future, name in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    self.errors[name] = str(e)
+
 
 class ModelsPage:
     """Page for viewing and managing models"""
@@ -26,12 +106,18 @@ class ModelsPage:
         if "download_model_name" not in st.session_state:
             st.session_state.download_model_name = ""
 
+        if "download_model_names" not in st.session_state:
+            st.session_state.download_model_names = []
+
         if "download_complete" not in st.session_state:
             st.session_state.download_complete = False
 
         if "download_error" not in st.session_state:
             st.session_state.download_error = None
 
+        if "download_job" not in st.session_state:
+            st.session_state.download_job = None
+
         if "show_model_variants" not in st.session_state:
             st.session_state.show_model_variants = None
 
@@ -142,6 +228,20 @@ class ModelsPage:
             # Invalid cache file
             return None
 
+    def _remove_from_cache(self, cache_key: str) -> None:
+        """
+        Remove a cache file if it exists
+
+        Args:
+            cache_key: Cache identifier
+        """
+        try:
+            os.remove(self._get_cache_path(cache_key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Failed to remove cache file: {str(e)}")
+
     def _get_local_models(self, use_cache=True):
         """
         Get local models with optional caching
@@ -152,10 +252,7 @@ class ModelsPage:
         Returns:
             List of local models
         """
-        # Cache miss, get fresh data
-        models = OllamaAPI.get_local_models()
-
-        return models
+        return OllamaAPI.get_local_models(use_cache=use_cache)
 
     def _get_model_info(self, model_name: str, use_cache=True):
         """
@@ -178,14 +275,34 @@ class ModelsPage:
         # Cache miss, get fresh data
         model_info = OllamaAPI.get_model_info(model_name)
 
-        # Try to cache, but continue even if caching fails
-        try:
-            self._save_to_cache(cache_key, model_info)
-        except Exception as e:
-            print(f"Warning: Failed to cache model info: {str(e)}")
+        # Try to cache, but continue even if caching fails. An empty result
+        # means the lookup failed, so it is not cached
+        if model_info:
+            try:
+                self._save_to_cache(cache_key, model_info)
+            except Exception as e:
+                print(f"Warning: Failed to cache model info: {str(e)}")
 
         return model_info
 
+    def _set_search_results(self, results):
+        """
+        Store the Search tab's results grouped by filter category
+
+        Each category's results are built once here, so changing the filter
+        doesn't rescan them on every rerun.
+
+        Args:
+            results: The search results
+        """
+        # Catalog tags are always built lowercase, so match them as they are
+        buckets = {"All": results}
+        for category in SEARCH_FILTERS[1:]:
+            filter_term = category.lower()
+            buckets[category] = [r for r in results if filter_term in r["tags"]]
+
+        st.session_state.search_buckets = buckets
+
     def _search_models(self, search_query: str, use_cache=True):
         """
         Search models with optional caching
@@ -197,6 +314,9 @@ class ModelsPage:
         Returns:
             Search results
         """
+        # Matching ignores case and surrounding whitespace, so normalize the
+        # query once and let variants of it share a cache entry
+        search_query = search_query.strip().lower()
         cache_key = f"search_results_{search_query}"
 
         if use_cache:
@@ -205,7 +325,7 @@ class ModelsPage:
                 return cached_data
 
         # Cache miss, get fresh data
-        results = OllamaAPI.search_models(search_query)
+        results = OllamaAPI.search_models(search_query, use_cache=use_cache)
 
         # Try to cache, but continue even if caching fails
         try:
@@ -241,7 +361,7 @@ class ModelsPage:
                 # Ensure size_value is a number before division
                 try:
                     size_gb = (
-                        round(float(size_value) / (1024**3), 2) if size_value else 0
+                        round(float(size_value) / BYTES_PER_GB, 2) if size_value else 0
                     )
                 except (TypeError, ValueError):
                     # If conversion to float fails, default to 0
@@ -255,43 +375,49 @@ class ModelsPage:
                     }
                 )
 
-            df = pd.DataFrame(model_data)
-
             # Display the table
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(model_data, use_container_width=True)
 
-            # Select a model for actions
+            # Select a model for actions. The form keeps picking a model from
+            # triggering a rerun; only the action buttons submit it
             st.subheader("Model Actions")
-            selected_model = st.selectbox(
-                "Select a model", [m.get("model") for m in models]
-            )
+            with st.form("model_actions", border=False):
+                selected_model = st.selectbox(
+                    "Select a model", [m.get("model") for m in models]
+                )
 
-            # Action buttons
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Show Details", key=f"details_{selected_model}"):
-                    # Set session state to show details
-                    st.session_state.show_model_details = selected_model
-                    st.rerun()
+                # Action buttons
+                col1, col2 = st.columns(2)
+                with col1:
+                    show_details = st.form_submit_button("Show Details")
+                with col2:
+                    delete_model = st.form_submit_button("Delete Model")
 
-            with col2:
-                if st.button("Delete Model", key=f"delete_{selected_model}"):
-                    if st.session_state.get("confirm_delete") != selected_model:
-                        st.session_state.confirm_delete = selected_model
-                        st.warning(
-                            f"Click again to confirm deletion of {selected_model}"
-                        )
-                    else:
-                        with st.spinner(f"Deleting {selected_model}..."):
-                            if selected_model is not None and OllamaAPI.delete_model(
-                                str(selected_model)
-                            ):
-                                st.success(f"Successfully deleted {selected_model}")
-                                st.session_state.confirm_delete = None
-                                time.sleep(1)
-                                st.rerun()
-                            else:
-                                st.error(f"Failed to delete {selected_model}")
+            if show_details:
+                # Set session state to show details
+                st.session_state.show_model_details = selected_model
+                st.rerun()
+
+            if delete_model:
+                if st.session_state.get("confirm_delete") != selected_model:
+                    st.session_state.confirm_delete = selected_model
+                    st.warning(
+                        f"Click again to confirm deletion of {selected_model}"
+                    )
+                else:
+                    with st.spinner(f"Deleting {selected_model}..."):
+                        if selected_model is not None and OllamaAPI.delete_model(
+                            str(selected_model)
+                        ):
+                            st.success(f"Successfully deleted {selected_model}")
+                            st.session_state.confirm_delete = None
+                            self._remove_from_cache(
+                                f"model_info_{selected_model}"
+                            )
+                            time.sleep(1)
+                            st.rerun()
+                        else:
+                            st.error(f"Failed to delete {selected_model}")
 
     def render_model_details(self, model_name: str):
         """
@@ -311,34 +437,18 @@ class ModelsPage:
                     # Basic model information
                     st.write("### Basic Information")
 
-                    # Handle different API response formats
-                    if "details" in model_info:
-                        # New API format
-                        basic_info = {
-                            "Model Name": model_name,
-                            "Family": model_info["details"].get("family", "Unknown"),
-                            "Parameter Size": model_info["details"].get(
-                                "parameter_size", "Unknown"
-                            ),
-                            "Quantization Level": model_info["details"].get(
-                                "quantization_level", "Unknown"
-                            ),
-                        }
-                    else:
-                        # Old API format
-                        basic_info = {
-                            "Model Name": model_name,
-                            "Family": model_info.get("family", "Unknown"),
-                            "Parameter Size": model_info.get(
-                                "parameter_size", "Unknown"
-                            ),
-                            "Quantization Level": model_info.get(
-                                "quantization_level", "Unknown"
-                            ),
-                        }
-
-                    # Convert to DataFrame for nicer display
-                    st.dataframe(pd.DataFrame([basic_info]), use_container_width=True)
+                    # Newer API responses nest these fields under "details"
+                    source = model_info.get("details") or model_info
+                    basic_info = {
+                        "Model Name": model_name,
+                        **{
+                            label: source.get(key, "Unknown")
+                            for label, key in BASIC_INFO_FIELDS
+                        },
+                    }
+
+                    # Display as a one-row table
+                    st.dataframe([basic_info], use_container_width=True)
 
                     # System info
                     if "system" in model_info:
@@ -355,9 +465,8 @@ class ModelsPage:
                         st.write("### Model Parameters")
                         params = model_info.get("parameters", {})
                         if params:
-                            # Convert to DataFrame for nicer display
-                            params_df = pd.DataFrame([params])
-                            st.dataframe(params_df, use_container_width=True)
+                            # Display as a one-row table
+                            st.dataframe([params], use_container_width=True)
 
                     # License
                     if "license" in model_info:
@@ -406,8 +515,7 @@ class ModelsPage:
                 })
 
             # Display as a table
-            df = pd.DataFrame(variant_data)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(variant_data, use_container_width=True)
 
             # Dropdown to select variant
             variant_options = [v.get('tag') for v in model_data['variants']]
@@ -417,20 +525,23 @@ class ModelsPage:
                 format_func=lambda x: f"{x} ({next((v['size'] for v in model_data['variants'] if v['tag'] == x), 'Unknown')})"
             )
 
-            if st.button("Download Selected Variant", key="download_variant"):
-                if selected_variant and selected_variant.strip():
-                    self.pull_model(selected_variant.strip())
-                else:
-                    st.error("Please select a valid variant")
+            st.button(
+                "Download Selected Variant",
+                key="download_variant",
+                on_click=self.pull_model,
+                args=(selected_variant or "",),
+                disabled=not selected_variant,
+            )
         else:
             st.warning("No variants information available for this model.")
 
             # Fallback option to download the base model
-            if st.button("Download Base Model"):
-                if model_data['name'] and model_data['name'].strip():
-                    self.pull_model(model_data['name'].strip())
-                else:
-                    st.error("Invalid model name")
+            st.button(
+                "Download Base Model",
+                on_click=self.pull_model,
+                args=(model_data['name'] or "",),
+                disabled=not (model_data['name'] or "").strip(),
+            )
 
     def download_model(self):
         """Handle downloading a model with progress display"""
@@ -438,56 +549,75 @@ class ModelsPage:
             return
 
         model_name = st.session_state.download_model_name
-        overlay_container = st.container()
+        model_names = st.session_state.download_model_names or [model_name]
 
-        with overlay_container:
-            with st.status(f"Downloading {model_name}", expanded=True) as status:
-                try:
-                    progress_bar = st.progress(0)
-
-                    # Perform the actual download
-                    for progress in OllamaAPI.perform_pull(model_name):
-                        if "status" in progress:
-                            status.update(label=f"Status: {progress['status']}")
-
-                        if "completed" in progress and "total" in progress:
-                            # Add safety check for zero division
-                            total = progress["total"]
-                            if total > 0:  # Only calculate percent if total is positive
-                                percent = progress["completed"] / total
-                                progress_bar.progress(percent)
-                                status.update(
-                                    label=f"Downloaded: {int(percent * 100)}% of {model_name}"
-                                )
-                            else:
-                                status.update(label=f"Preparing download: {model_name}")
-
-                    # Mark download as complete
-                    progress_bar.progress(1.0)
-                    status.update(
-                        label=f"Successfully downloaded {model_name}", state="complete"
-                    )
+        job = st.session_state.download_job
+        if job is None or job.model_names != model_names:
+            job = PullJob(model_names)
+            st.session_state.download_job = job
+
+        if not job.done:
+            self.render_download_progress(job)
+            return
+
+        with st.status(f"Downloading {model_name}", expanded=True) as status:
+            if job.errors:
+                error = "; ".join(
+                    f"{name}: {error}" for name, error in job.errors.items()
+                )
+                st.session_state.download_error = error
+                status.update(label=f"Error: {error}", state="error")
+
+                if st.button("Dismiss Error"):
+                    st.session_state.show_download_status = False
+                    st.session_state.download_job = None
+                    st.rerun()
+            else:
+                # Mark download as complete
+                st.progress(1.0)
+                status.update(
+                    label=f"Successfully downloaded {model_name}", state="complete"
+                )
+                if not st.session_state.download_complete:
                     st.session_state.download_complete = True
 
-                    # Invalidate local models cache after successful download
-                    cache_path = self._get_cache_path("local_models")
-                    if os.path.exists(cache_path):
-                        try:
-                            os.remove(cache_path)
-                        except:
-                            pass
+                    # Drop the cached details of the pulled models. The list
+                    # of local models is refreshed by OllamaAPI.perform_pull
+                    for pulled_name in model_names:
+                        self._remove_from_cache(f"model_info_{pulled_name}")
 
-                    if st.button("Close"):
-                        st.session_state.show_download_status = False
-                        st.rerun()
+                if st.button("Close"):
+                    st.session_state.show_download_status = False
+                    st.session_state.download_job = None
+                    st.rerun()
 
-                except Exception as e:
-                    st.session_state.download_error = str(e)
-                    status.update(label=f"Error: {str(e)}", state="error")
+    @st.fragment(run_every=DOWNLOAD_POLL_INTERVAL)
+    def render_download_progress(self, job: PullJob):
+        """
+        Show the progress of a running download
 
-                    if st.button("Dismiss Error"):
-                        st.session_state.show_download_status = False
-                        st.rerun()
+        Runs as a fragment that redraws itself every DOWNLOAD_POLL_INTERVAL
+        seconds, and reruns the whole page once the download has finished.
+
+        Args:
+            job: The running download
+        """
+        if job.done:
+            st.rerun()
+
+        model_name = st.session_state.download_model_name
+        if len(job.model_names) > 1:
+            target = f"{len(job.model_names)} models"
+        else:
+            target = model_name
+
+        with st.status(f"Downloading {model_name}", expanded=True) as status:
+            percent = job.percent
+            st.progress(percent)
+            if percent > 0:
+                status.update(label=f"Downloaded: {int(percent * 100)}% of {target}")
+            else:
+                status.update(label=f"Preparing download: {target}")
 
     def render_search_box(self):
         """Render the model search box in the sidebar"""
@@ -528,6 +658,9 @@ class ModelsPage:
         """
         Prepare to pull a model
 
+        Used as a button callback, so the download overlay shows on the rerun
+        the click already causes instead of needing another one.
+
         Args:
             model_name: Name of the model to pull
         """
@@ -542,16 +675,38 @@ class ModelsPage:
             # Set session state for download
             st.session_state.show_download_status = True
             st.session_state.download_model_name = model_name
+            st.session_state.download_model_names = [model_name]
             st.session_state.download_complete = False
             st.session_state.download_error = None
-
-            # Rerun to show the overlay immediately
-            st.rerun()
         except Exception as e:
             error_msg = f"Error preparing to pull model {model_name}: {str(e)}"
             st.error(error_msg)
             return False
 
+    def pull_models(self, model_names: List[str]):
+        """
+        Prepare to pull several models at once
+
+        Args:
+            model_names: Names of the models to pull
+        """
+        model_names = [name.strip() for name in model_names if name.strip()]
+        if not model_names:
+            st.error("No models selected")
+            return False
+
+        # Set session state for download
+        st.session_state.show_download_status = True
+        st.session_state.download_model_name = ", ".join(model_names)
+        st.session_state.download_model_names = model_names
+        st.session_state.download_complete = False
+        st.session_state.download_error = None
+
+        # This is called from inside the views fragment, where a callback
+        # would only rerun the fragment; rerun the whole page so the overlay
+        # replaces it
+        st.rerun()
+
     def render_search_tab(self):
         """Render the search tab UI with default model listing"""
         st.subheader("Search for Models")
@@ -571,33 +726,48 @@ class ModelsPage:
             if st.button("Search", disabled=not search_tab_query):
                 with st.spinner("Searching models..."):
                     results = self._search_models(search_tab_query, use_cache=use_cache)
-                    st.session_state.search_results_tab = results
+                    self._set_search_results(results)
 
         with col2:
-            filter_options = ["All", "Code", "Vision", "Small", "Medium", "Large"]
-            selected_filter = st.selectbox("Filter by category", filter_options)
+            selected_filter = st.selectbox("Filter by category", SEARCH_FILTERS)
 
         # Initialize or get search results
-        if "search_results_tab" not in st.session_state:
+        if "search_buckets" not in st.session_state:
             with st.spinner("Loading available models..."):
                 # Get all models by using an empty search
-                st.session_state.search_results_tab = self._search_models(
-                    "", use_cache=use_cache
-                )
+                self._set_search_results(self._search_models("", use_cache=use_cache))
 
-        results = st.session_state.search_results_tab
-
-        # Apply filter if selected
-        if selected_filter != "All":
-            filter_term = selected_filter.lower()
-            results = [r for r in results if filter_term in r["tags"].lower()]
+        results = st.session_state.search_buckets[selected_filter]
 
         if results:
             st.write(f"Found {len(results)} models:")
 
+            # Names of the installed models, to mark results as installed
+            installed_names = {
+                m.get("model") for m in self._get_local_models(use_cache=use_cache)
+            }
+
+            # The whole catalog is listed by default, so only render one page
+            # of cards; each card is several elements plus a button
+            page_count = -(-len(results) // SEARCH_RESULTS_PER_PAGE)
+            page = 1
+            if page_count > 1:
+                # A narrower filter may leave fewer pages than before
+                if st.session_state.get("search_results_page", 1) > page_count:
+                    st.session_state.search_results_page = 1
+                page = st.number_input(
+                    f"Page (of {page_count})",
+                    min_value=1,
+                    max_value=page_count,
+                    key="search_results_page",
+                )
+            start = (page - 1) * SEARCH_RESULTS_PER_PAGE
+
             # Create a grid of cards for search results
             cols = st.columns(3)
-            for i, model in enumerate(results):
+            for i, model in enumerate(
+                results[start : start + SEARCH_RESULTS_PER_PAGE], start
+            ):
                 with cols[i % 3]:
                     with st.container(border=True):
                         st.write(f"**{model['name']}**")
@@ -608,8 +778,7 @@ class ModelsPage:
                         variant_text = f"{variant_count} variant{'s' if variant_count != 1 else ''}"
 
                         # Check if model is already installed
-                        models = self._get_local_models(use_cache=use_cache)
-                        installed = any(m.get("model") == model["name"] for m in models)
+                        installed = model["name"] in installed_names
 
                         if installed:
                             st.success("✓ Installed")
@@ -619,6 +788,17 @@ class ModelsPage:
                                 st.session_state.show_model_variants = model
                                 st.rerun()
 
+            # Pull several of the listed models in one go
+            available_names = [
+                r["name"] for r in results if r["name"] not in installed_names
+            ]
+            if available_names:
+                selected_names = st.multiselect(
+                    "Select models to pull", available_names, key="pull_selection"
+                )
+                if st.button("Pull Selected", disabled=not selected_names):
+                    self.pull_models(selected_names)
+
         else:
             st.info("No models found matching your criteria")
 
@@ -647,10 +827,29 @@ class ModelsPage:
                     for file in os.listdir(self.cache_dir):
                         if file.endswith(".json"):
                             os.remove(os.path.join(self.cache_dir, file))
+                    st.cache_data.clear()
                     st.success("Cache cleared successfully")
                 except Exception as e:
                     st.error(f"Error clearing cache: {str(e)}")
 
+        # Render search box in sidebar
+        self.render_search_box()
+
+        # Check if we should show model details
+        if st.session_state.show_model_details:
+            self.render_model_details(st.session_state.show_model_details)
+        else:
+            self.render_tabs()
+
+    @st.fragment
+    def render_tabs(self):
+        """
+        Render the list and search views
+
+        Runs as a fragment, so switching views or searching reruns only this
+        part of the page. Actions that change the rest of the page trigger a
+        full rerun.
+        """
         # Get installed models (using cache by default)
         try:
             models = self._get_local_models()
@@ -658,25 +857,18 @@ class ModelsPage:
             st.error(f"Error loading models: {str(e)}")
             models = []
 
-        # Render search box in sidebar
-        self.render_search_box()
+        # Choose between list and search views
+        tab_options = ["📋 Models List", "🔍 Search"]
+        selected_tab = st.radio(
+            "View",
+            tab_options,
+            index=0,
+            horizontal=True,
+            label_visibility="collapsed",
+        )
 
-        # Check if we should show model details
-        if st.session_state.show_model_details:
-            self.render_model_details(st.session_state.show_model_details)
+        # Display content based on selected tab
+        if selected_tab == "📋 Models List":
+            self.render_model_list(models)
         else:
-            # Choose between list and search views
-            tab_options = ["📋 Models List", "🔍 Search"]
-            selected_tab = st.radio(
-                "View",
-                tab_options,
-                index=0,
-                horizontal=True,
-                label_visibility="collapsed",
-            )
-
-            # Display content based on selected tab
-            if selected_tab == "📋 Models List":
-                self.render_model_list(models)
-            else:
-                self.render_search_tab()
+            self.render_search_tab()
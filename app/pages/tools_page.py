@@ -1,3 +1,4 @@
+import copy
 import json
 import uuid
 import tempfile
@@ -20,6 +21,68 @@ from app.utils.tool_loader import ToolLoader
 logger = get_logger()
 
 
+# Common tool templates offered in the tool editor. Shared by every session,
+# so the editor deep-copies a template before filling it in
+TOOL_TEMPLATES = {
+    "Web Search": {
+        "type": "function",
+        "function": {
+            "name": "web_search",
+            "description": "Search the web for information",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "The search query",
+                    }
+                },
+                "required": ["query"],
+            },
+        },
+    },
+    "Calculator": {
+        "type": "function",
+        "function": {
+            "name": "calculator",
+            "description": "Perform mathematical calculations",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "expression": {
+                        "type": "string",
+                        "description": "The mathematical expression to evaluate",
+                    }
+                },
+                "required": ["expression"],
+            },
+        },
+    },
+    "Weather Info": {
+        "type": "function",
+        "function": {
+            "name": "get_weather",
+            "description": "Get weather information for a location",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "location": {
+                        "type": "string",
+                        "description": "City or location name",
+                    },
+                    "units": {
+                        "type": "string",
+                        "description": "Units for temperature (celsius/fahrenheit)",
+                        "enum": ["celsius", "fahrenheit"],
+                    },
+                },
+                "required": ["location"],
+            },
+        },
+    },
+}
+
+
 class ToolsPage:
     """Page for generating and managing tools for LLM models"""
 
@@ -41,65 +104,7 @@ class ToolsPage:
             st.session_state.lint_results = {}
 
         if "tool_templates" not in st.session_state:
-            # Initialize with some common tool templates
-            st.session_state.tool_templates = {
-                "Web Search": {
-                    "type": "function",
-                    "function": {
-                        "name": "web_search",
-                        "description": "Search the web for information",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string",
-                                    "description": "The search query",
-                                }
-                            },
-                            "required": ["query"],
-                        },
-                    },
-                },
-                "Calculator": {
-                    "type": "function",
-                    "function": {
-                        "name": "calculator",
-                        "description": "Perform mathematical calculations",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "expression": {
-                                    "type": "string",
-                                    "description": "The mathematical expression to evaluate",
-                                }
-                            },
-                            "required": ["expression"],
-                        },
-                    },
-                },
-                "Weather Info": {
-                    "type": "function",
-                    "function": {
-                        "name": "get_weather",
-                        "description": "Get weather information for a location",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "location": {
-                                    "type": "string",
-                                    "description": "City or location name",
-                                },
-                                "units": {
-                                    "type": "string",
-                                    "description": "Units for temperature (celsius/fahrenheit)",
-                                    "enum": ["celsius", "fahrenheit"],
-                                },
-                            },
-                            "required": ["location"],
-                        },
-                    },
-                },
-            }
+            st.session_state.tool_templates = TOOL_TEMPLATES
 
     def add_tool(self, tool_data: Dict[str, Any]) -> str:
         """
@@ -173,7 +178,7 @@ class ToolsPage:
                 },
             }
         else:
-            tool_data = st.session_state.tool_templates[selected_template].copy()
+            tool_data = copy.deepcopy(st.session_state.tool_templates[selected_template])
 
         # Check if we're editing an existing tool
         editing_existing = st.session_state.selected_tool is not None
@@ -362,8 +367,9 @@ class ToolsPage:
                             else:
                                 # Execute the tool
                                 with st.spinner("Executing tool..."):
+                                    # Reuse the function loaded above
                                     result = ToolLoader.execute_tool(
-                                        tool_name, parameters
+                                        function or tool_name, parameters
                                     )
                                 st.write("Result:")
                                 st.json(result)
@@ -68,6 +68,23 @@ class AgentGroup:
             created_at=data.get("created_at"),
         )
 
+    def get_agent(self, name: str) -> Optional[Agent]:
+        """Find an agent in this group by name"""
+        return next((a for a in self.agents if a.name == name), None)
+
+    def get_agents_by_name(self) -> Dict[str, Agent]:
+        """
+        Map agent names to agents for repeated lookups.
+
+        The map is built on each call since agents can be renamed or replaced
+        in place; build it once per operation rather than once per lookup.
+        """
+        agents_by_name: Dict[str, Agent] = {}
+        for agent in self.agents:
+            # Keep the first agent with a given name, as get_agent does
+            agents_by_name.setdefault(agent.name, agent)
+        return agents_by_name
+
     def add_shared_memory(self, content: str, source: str = "group"):
         """Add a memory entry to the group's shared memory"""
         timestamp = datetime.now().isoformat()
@@ -78,6 +95,11 @@ class AgentGroup:
                 "timestamp": timestamp,
             }
         )
+
+        # Trim shared memory if it gets too large (keep last 100 entries)
+        if len(self.shared_memory) > 100:
+            self.shared_memory = self.shared_memory[-100:]
+
         logger.info(f"Added shared memory to group {self.name} from source: {source}")
         logger.debug(f"Shared memory content: {content}, Timestamp: {timestamp}")
 
@@ -264,6 +286,7 @@ Analyze this task and create a plan using the available agents. If an agent does
                 # Execute each step with the assigned agent
                 results = []
                 step_count = len(plan["steps"])
+                agents_by_name = self.get_agents_by_name()
 
                 for step_index, step in enumerate(plan["steps"]):
                     agent_name = step["agent"]
@@ -275,7 +298,7 @@ Analyze this task and create a plan using the available agents. If an agent does
                     )
                     logger.debug(f"Step {step_index+1} reason: {reason}")
 
-                    agent = next((a for a in self.agents if a.name == agent_name), None)
+                    agent = agents_by_name.get(agent_name)
 
                     if agent:
                         step_start_time = time.time()
@@ -465,10 +488,14 @@ Analyze this task and create a plan using the available agents. Break it down in
                     history_id = self.add_to_history(history_entry)
                     logger.info(f"Added manager execution to history with ID: {history_id}, current history size: {len(self.execution_history)}")
                     
-                    # Import and call save_agents to persist changes
-                    from app.utils.agents.ui_components import save_agents
-                    save_agents()
-                    logger.info(f"Saved agent groups with updated history to disk")
+                    # Import here to avoid a circular import, then persist
+                    # the history entry and the updated memories
+                    from app.utils.agents.ui_components import (
+                        append_history_entry,
+                        save_agents_debounced,
+                    )
+                    append_history_entry(self.id, history_entry)
+                    save_agents_debounced()
 
                     return {
                         "status": "success",
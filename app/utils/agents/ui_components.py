@@ -3,17 +3,27 @@ UI components for the agents page.
 """
 
 import streamlit as st
+import atexit
+import copy
+import functools
+import logging
+import math
 import os
 import json
 import traceback
 import re
-from typing import Dict, List, Any, Optional
+import shutil
+from typing import Dict, List, Any, Optional, Tuple
+import threading
 import time
 from datetime import datetime
 import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from app.api.ollama_api import OllamaAPI
 from app.utils.logger import get_logger
+from app.utils.json_utils import dumps_json, loads_json
 from app.utils.tool_loader import ToolLoader
 from app.utils.agents.agent import Agent
 from app.utils.agents.agent_group import AgentGroup
@@ -21,6 +31,40 @@ from app.utils.agents.agent_group import AgentGroup
 # Get application logger
 logger = get_logger()
 
+# Agent data lives under app/data/agents; resolve it once at import time
+AGENTS_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+    "app",
+    "data",
+    "agents",
+)
+os.makedirs(AGENTS_DATA_DIR, exist_ok=True)
+AGENT_GROUPS_PATH = os.path.join(AGENTS_DATA_DIR, "agent_groups.json")
+
+# Execution history is appended here, one {"group_id", "entry"} record per
+# line, so recording a task does not rewrite the whole agent groups file
+AGENT_HISTORY_PATH = os.path.join(AGENTS_DATA_DIR, "agent_groups.history.jsonl")
+
+# Compact the history file once it grows past this size, keeping the last
+# HISTORY_KEEP_ENTRIES entries of each group
+HISTORY_COMPACT_BYTES = 5 * 1024 * 1024
+HISTORY_KEEP_ENTRIES = 100
+
+# Upper bound on agents running at once in a multi-agent execution
+MAX_PARALLEL_AGENTS = 8
+
+# Delay before a debounced save is written to disk
+SAVE_DEBOUNCE_SECONDS = 0.5
+
+# Pending debounced save: serialized payload and group count, plus the timer
+# that will flush it
+_pending_save: Optional[Tuple[str, int]] = None
+_save_timer: Optional[threading.Timer] = None
+_save_lock = threading.RLock()
+
+# Matches the @name: marker that starts an agent directive
+_DIRECTIVE_NAME_RE = re.compile(r"@([^:]+):")
+
 
 def parse_agent_directives(task: str, available_agents: List[Agent]) -> Dict[str, str]:
     """
@@ -33,32 +77,44 @@ def parse_agent_directives(task: str, available_agents: List[Agent]) -> Dict[str
     Returns:
         Dictionary mapping agent names to their subtasks
     """
+    # Directives always start with @, so skip the regex scan without one
+    if not task or "@" not in task:
+        return {}
+
+    # Reruns with an unchanged task reuse the cached parse; copy it so
+    # callers can't modify the cached dict
+    agent_names = tuple(agent.name for agent in available_agents)
+    return dict(_parse_agent_directives(task, agent_names))
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_agent_directives(task: str, agent_names: Tuple[str, ...]) -> Dict[str, str]:
+    """Parse @agent_name directives against the given agent names, memoized"""
     logger.info(f"Parsing agent directives in task: {task[:50]}...")
     
-    # Get list of agent names
-    agent_names = [agent.name.lower() for agent in available_agents]
+    # Map lowercased agent names to their correctly cased names
+    name_map = {name.lower(): name for name in agent_names}
     
     # Check for @agent_name pattern
     directives = {}
     
-    # Use regex pattern that matches @name: followed by text until the next @name: or end of string
-    pattern = r'@([^:]+):(.*?)(?=@[^:]+:|$)'
-    matches = re.findall(pattern, task, re.DOTALL)
+    # Each directive's subtask runs from its @name: marker to the next marker
+    # or the end of the task
+    markers = list(_DIRECTIVE_NAME_RE.finditer(task))
+    ends = [marker.start() for marker in markers[1:]] + [len(task)]
     
-    for agent_name, subtask in matches:
-        agent_name = agent_name.strip().lower()
-        subtask = subtask.strip()
+    for marker, end in zip(markers, ends):
+        agent_name = marker.group(1).strip().lower()
+        subtask = task[marker.end():end].strip()
         
         # Check if this is a valid agent
-        for available_name in agent_names:
-            if agent_name == available_name.lower():
-                # Use the correctly cased agent name
-                correct_name = next(a.name for a in available_agents if a.name.lower() == agent_name)
-                directives[correct_name] = subtask
-                logger.info(f"Found directive for agent {correct_name}: {subtask[:30]}...")
-                break
-        else:
+        correct_name = name_map.get(agent_name)
+        if correct_name is None:
             logger.warning(f"Directive for unknown agent '{agent_name}' found in task")
+            continue
+        
+        directives[correct_name] = subtask
+        logger.info(f"Found directive for agent {correct_name}: {subtask[:30]}...")
     
     return directives
 
@@ -76,13 +132,36 @@ def process_markdown(content: str) -> str:
     if not content:
         return ""
 
-    # Ensure code blocks are properly formatted
-    # This helps with proper syntax highlighting
-    content = re.sub(r"```(\w+)\n", r"```\1\n", content)
-
+    # Content is already valid markdown; fenced code blocks render with
+    # syntax highlighting as-is
     return content
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_model_names() -> List[str]:
+    """Get the names of the local models, cached across reruns"""
+    models = OllamaAPI.get_local_models()
+    return [m.get("model", "unknown") for m in models]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_tool_names() -> List[str]:
+    """Get the names of the installed tools, cached across reruns"""
+    return ToolLoader.list_available_tools()
+
+
+def _load_tool_definition(tool_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a tool's definition
+
+    ToolLoader caches tools on their files' modification times, so edits in
+    the tools directory are picked up. The cached definition is shared, so a
+    copy is returned for the agent to keep.
+    """
+    _, tool_def = ToolLoader.load_tool_function(tool_name)
+    return copy.deepcopy(tool_def)
+
+
 def render_agent_editor(
     editing_agent: Optional[Agent], selected_group: Optional[AgentGroup]
 ):
@@ -90,14 +169,17 @@ def render_agent_editor(
     logger.info("Rendering agent editor")
     st.subheader("Agent Editor")
 
+    if st.button("🔄 Refresh Models and Tools"):
+        _cached_model_names.clear()
+        _cached_tool_names.clear()
+
     # Get available models
-    models = OllamaAPI.get_local_models()
-    model_names = [m.get("model", "unknown") for m in models]
-    logger.info(f"Loaded {len(model_names)} available models")
+    model_names = _cached_model_names()
+    logger.debug(f"Loaded {len(model_names)} available models")
 
     # Get available tools
-    installed_tools = ToolLoader.list_available_tools()
-    logger.info(f"Loaded {len(installed_tools)} available tools")
+    installed_tools = _cached_tool_names()
+    logger.debug(f"Loaded {len(installed_tools)} available tools")
 
     with st.form("agent_editor"):
         name = st.text_input(
@@ -132,17 +214,17 @@ def render_agent_editor(
             current_tool_names = [
                 tool["function"]["name"] for tool in editing_agent.tools
             ]
-            logger.info(f"Editing agent has {len(current_tool_names)} tools selected")
-
-        for tool_name in installed_tools:
-            if st.checkbox(
-                tool_name,
-                value=tool_name in current_tool_names,
-            ):
-                _, tool_def = ToolLoader.load_tool_function(tool_name)
-                if tool_def:
-                    selected_tools.append(tool_def)
-                    logger.info(f"Tool selected: {tool_name}")
+            logger.debug(f"Editing agent has {len(current_tool_names)} tools selected")
+
+        chosen_tools = st.multiselect(
+            "Tools",
+            options=installed_tools,
+            default=[t for t in installed_tools if t in current_tool_names],
+        )
+        for tool_name in chosen_tools:
+            tool_def = _load_tool_definition(tool_name)
+            if tool_def:
+                selected_tools.append(tool_def)
 
         if st.form_submit_button("Save Agent"):
             logger.info(f"Save Agent button clicked for agent: {name}")
@@ -165,14 +247,15 @@ def render_agent_editor(
                 agent = editing_agent
                 logger.info(f"Updating existing agent {agent.name} (ID: {agent.id})")
 
-                # Log the changes for debugging
-                logger.info(f"Updating agent properties:")
-                logger.info(f"  Name: {agent.name} -> {name}")
-                logger.info(f"  Model: {agent.model} -> {model}")
-                logger.info(
-                    f"  System prompt length: {len(agent.system_prompt)} -> {len(system_prompt)}"
-                )
-                logger.info(f"  Tools: {len(agent.tools)} -> {len(selected_tools)}")
+                # Log the changes for debugging as a single record
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Updating agent properties: "
+                        f"name {agent.name} -> {name}, "
+                        f"model {agent.model} -> {model}, "
+                        f"system prompt length {len(agent.system_prompt)} -> {len(system_prompt)}, "
+                        f"tools {len(agent.tools)} -> {len(selected_tools)}"
+                    )
 
                 # Update the agent properties
                 agent.name = name
@@ -181,24 +264,26 @@ def render_agent_editor(
                 agent.tools = selected_tools
 
                 # Find the agent in the group by ID and update it
-                for i, existing_agent in enumerate(selected_group.agents):
-                    if existing_agent.id == agent.id:
-                        logger.info(
-                            f"Found agent {agent.name} (ID: {agent.id}) in group at index {i}"
-                        )
-                        # Replace the agent in the group with the updated version
-                        selected_group.agents[i] = agent
-                        logger.info(
-                            f"Updated agent in group: {agent.name} (ID: {agent.id}, Model: {agent.model})"
-                        )
-                        break
+                index = next(
+                    (
+                        i
+                        for i, existing_agent in enumerate(selected_group.agents)
+                        if existing_agent.id == agent.id
+                    ),
+                    None,
+                )
+                if index is not None:
+                    # Replace the agent in the group with the updated version
+                    selected_group.agents[index] = agent
+                    logger.info(
+                        f"Updated agent in group at index {index}: {agent.name} (ID: {agent.id}, Model: {agent.model})"
+                    )
                 else:
                     # Agent not found in group, add it
+                    selected_group.agents.append(agent)
                     logger.info(
-                        f"Adding existing agent {name} (ID: {agent.id}) to group {selected_group.name}"
+                        f"Added existing agent {name} (ID: {agent.id}) to group {selected_group.name}, which now has {len(selected_group.agents)} agents"
                     )
-                    selected_group.agents.append(agent)
-                    logger.info(f"Group now has {len(selected_group.agents)} agents")
             else:
                 # Create new agent
                 agent = Agent(
@@ -213,11 +298,12 @@ def render_agent_editor(
 
             # Reset editing state
             st.session_state.editing_agent = None
+            st.session_state.editing_new = False
             logger.info("Reset editing_agent to None")
 
             # Save changes to disk
-            save_agents()
-            logger.info("Saved changes to disk")
+            save_agents_debounced()
+            logger.info("Scheduled save of changes to disk")
 
             # Show success message
             st.success(f"Agent '{name}' saved successfully!")
@@ -253,7 +339,7 @@ def render_group_editor():
             logger.info(f"Added group to session state and set as selected_group")
 
             # Save to disk
-            save_agents()
+            save_agents_debounced()
             st.rerun()
 
 
@@ -288,12 +374,7 @@ def render_group_view(group: AgentGroup):
                     st.session_state.editing_agent_original_group = group
             with col2:
                 if st.button("Delete Agent", key=f"delete_{agent.id}"):
-                    confirm_delete = st.checkbox("Confirm deletion", key=f"confirm_{agent.id}")
-                    if confirm_delete:
-                        group.agents = [a for a in group.agents if a.id != agent.id]
-                        save_agents()
-                        st.success(f"Agent {agent.name} deleted!")
-                        st.rerun()
+                    confirm_delete_agent(group, agent)
     
     # Display shared memory
     if group.shared_memory:
@@ -309,26 +390,95 @@ def render_group_view(group: AgentGroup):
     col1, col2 = st.columns(2)
     with col1:
         if st.button("Add New Agent"):
-            # Create a new empty agent and set it as editing_agent
-            st.session_state.editing_agent = Agent(
-                name="", model="", system_prompt="", tools=[]
-            )
+            # Open a blank editor; the agent is only created on save
+            st.session_state.editing_agent = None
+            st.session_state.editing_new = True
             st.rerun()
     with col2:
         if st.button("Delete Group"):
-            confirm_delete = st.checkbox("Confirm group deletion")
-            if confirm_delete:
-                if group in st.session_state.get("agent_groups", []):
-            st.session_state["agent_groups"].remove(group)
+            confirm_delete_group(group)
+
+
+@st.dialog("Delete Agent")
+def confirm_delete_agent(group: AgentGroup, agent: Agent):
+    """Ask for confirmation, then delete an agent from its group"""
+    st.write(f"Delete agent **{agent.name}** from group **{group.name}**?")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Delete", type="primary"):
+            group.agents = [a for a in group.agents if a.id != agent.id]
+            logger.info(f"Deleted agent {agent.name} (ID: {agent.id}) from group {group.name}")
+            # Deletions are written right away rather than debounced
+            save_agents()
+            st.rerun()
+    with col2:
+        if st.button("Cancel"):
+            st.rerun()
+
+
+@st.dialog("Delete Group")
+def confirm_delete_group(group: AgentGroup):
+    """Ask for confirmation, then delete an agent group"""
+    st.write(f"Delete group **{group.name}** and all of its agents?")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Delete", type="primary"):
+            st.session_state["agent_groups"] = [
+                g for g in st.session_state.get("agent_groups", []) if g.id != group.id
+            ]
             st.session_state.selected_group = None
+            logger.info(f"Deleted group {group.name} (ID: {group.id})")
+            # Deletions are written right away rather than debounced
             save_agents()
             st.rerun()
+    with col2:
+        if st.button("Cancel"):
+            st.rerun()
+
+
+def _store_execution_results(
+    result_type: str,
+    task: str,
+    result: Dict[str, Any],
+    parent_id: Optional[str] = None,
+    **extras: Any,
+):
+    """
+    Store an execution result in session state for display and continuation
+
+    Args:
+        result_type: The execution type (manager, single_agent, directive, multi_agent)
+        task: The task that was executed
+        result: The execution result
+        parent_id: History ID of the execution this one continues, if tracked
+        **extras: Type-specific fields such as agent_name or directives
+    """
+    results_data = {
+        "type": result_type,
+        "task": task,
+        "result": result,
+        **extras,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "history_id": result.get("history_id") or str(uuid.uuid4()),
+    }
+
+    # Add parent/child relationship for continuation chains
+    if parent_id:
+        results_data["parent_id"] = parent_id
+
+    st.session_state.agent_execution_results = results_data
 
 
 def render_task_executor(group: AgentGroup):
     """Render the task execution UI for an agent group."""
-    # Check if we're in continuation mode
+    # Read the session state used throughout this function once
     in_continuation_mode = st.session_state.get("in_continuation_mode", False)
+    target_agent = st.session_state.get("target_agent", "")
+
+    # Collect agent names and index agents by name once for the widgets and
+    # lookups below
+    agent_names = [agent.name for agent in group.agents]
+    agents_by_name = {agent.name: agent for agent in group.agents}
     
     # Create the task input
     if in_continuation_mode:
@@ -367,7 +517,7 @@ def render_task_executor(group: AgentGroup):
             # Display the detected directives
             st.success(f"Detected directives for {len(directives)} agents: {', '.join(directives.keys())}")
             agent_targeting = "directive"
-                    else:
+        else:
             # If no directives, show targeting options
             target_options = ["All Agents (Manager Coordinated)"]
             
@@ -375,13 +525,12 @@ def render_task_executor(group: AgentGroup):
             target_options.append("Select Multiple Agents")
             
             # Add individual agents
-            target_options.extend([agent.name for agent in group.agents])
+            target_options.extend(agent_names)
             
             # Pre-select the agent that was used in the previous execution if available
             default_index = 0
-            if "target_agent" in st.session_state and st.session_state.target_agent:
-                if st.session_state.target_agent in [agent.name for agent in group.agents]:
-                    default_index = target_options.index(st.session_state.target_agent)
+            if target_agent in agents_by_name:
+                default_index = target_options.index(target_agent)
             
             target = st.selectbox(
                 "Direct this continuation to:",
@@ -392,7 +541,6 @@ def render_task_executor(group: AgentGroup):
             
             # If "Select Multiple Agents" is chosen, show multiselect
             if target == "Select Multiple Agents":
-                agent_names = [agent.name for agent in group.agents]
                 selected_agents = st.multiselect(
                     "Select agents to include:",
                     options=agent_names,
@@ -407,24 +555,22 @@ def render_task_executor(group: AgentGroup):
                 # Show selected agents 
                 if selected_agents:
                     st.success(f"Task will be sent to: {', '.join(selected_agents)}")
-                            else:
+                else:
                     st.warning("Please select at least one agent")
             # Store the selected agent in session state
             elif target != "All Agents (Manager Coordinated)":
-                st.session_state.target_agent = target
+                st.session_state.target_agent = target_agent = target
                 agent_targeting = "specific"
             else:
-                st.session_state.target_agent = ""
+                st.session_state.target_agent = target_agent = ""
                 agent_targeting = "manager"
 
         # If user is continuing, add an option to include parent task ID for tracking the continuation chain
-        if "parent_execution_id" not in st.session_state:
-            st.session_state.parent_execution_id = None
-            
-        if "agent_execution_results" in st.session_state:
-            parent_result = st.session_state.agent_execution_results
-            if "history_id" in parent_result:
-                st.session_state.parent_execution_id = parent_result["history_id"]
+        parent_execution_id = st.session_state.get("parent_execution_id")
+        parent_result = st.session_state.get("agent_execution_results")
+        if parent_result and "history_id" in parent_result:
+            parent_execution_id = parent_result["history_id"]
+        st.session_state.parent_execution_id = parent_execution_id
                 
         # Store parent/child relationships for continuation chains
         track_chain = st.checkbox(
@@ -456,14 +602,14 @@ def render_task_executor(group: AgentGroup):
         with cont_col1:
             execute_button = st.button("▶️ Execute Continuation", type="primary")
         with cont_col2:
-            st.markdown(f"**Targeting:** {'Multiple Agents via Directives' if agent_targeting == 'directive' else ('Manager Coordination' if agent_targeting == 'manager' else f'Specific Agent ({st.session_state.target_agent})')}")
+            st.markdown(f"**Targeting:** {'Multiple Agents via Directives' if agent_targeting == 'directive' else ('Manager Coordination' if agent_targeting == 'manager' else f'Specific Agent ({target_agent})')}")
     
     # Normal execution mode (not continuation)
     else:
         # If task is empty, skip execution
         if not task.strip():
             st.warning("Please enter a task")
-                return
+            return
 
         # Check if there are @agent directives in the task
         directives = parse_agent_directives(task, group.agents)
@@ -477,15 +623,7 @@ def render_task_executor(group: AgentGroup):
                 result = execute_task_with_directives(group, task, directives)
             
             # Store in session state for continuation with history ID
-            history_id = result.get("history_id", str(uuid.uuid4()))
-            st.session_state.agent_execution_results = {
-                "type": "directive",
-                "task": task,
-                "result": result,
-                "directives": directives,
-                "timestamp": datetime.now().isoformat(),
-                "history_id": history_id
-            }
+            _store_execution_results("directive", task, result, directives=directives)
             
             # Display results
             display_directive_results(result, directives)
@@ -498,17 +636,10 @@ def render_task_executor(group: AgentGroup):
                 # Manager execution button
                 if st.button("▶️ Execute with Manager", type="primary"):
                     with st.spinner("Manager processing task..."):
-                result = group.execute_task_with_manager(task)
+                        result = group.execute_task_with_manager(task)
 
                     # Store in session state for continuation with history ID
-                    history_id = str(uuid.uuid4())
-                    st.session_state.agent_execution_results = {
-                        "type": "manager",
-                        "task": task,
-                        "result": result,
-                        "timestamp": datetime.now().isoformat(),
-                        "history_id": history_id
-                    }
+                    _store_execution_results("manager", task, result)
                     
                     # Display results
                     display_manager_results(result)
@@ -517,7 +648,7 @@ def render_task_executor(group: AgentGroup):
                 # Agent selection
                 agent_name = st.selectbox(
                     "Select agent",
-                    options=[agent.name for agent in group.agents],
+                    options=agent_names,
                     help="Choose which agent to execute this task"
                 )
                 
@@ -527,22 +658,17 @@ def render_task_executor(group: AgentGroup):
                         result = execute_with_agent(group, agent_name, task)
                     
                     # Store in session state for continuation with history ID
-                    history_id = str(uuid.uuid4())
-                    st.session_state.agent_execution_results = {
-                        "type": "single_agent",
-                        "task": task,
-                        "result": result,
-                        "agent_name": agent_name,
-                        "timestamp": datetime.now().isoformat(),
-                        "history_id": history_id
-                    }
+                    _store_execution_results(
+                        "single_agent", task, result, agent_name=agent_name
+                    )
 
                     # Display results
-                    display_agent_results(result, agent_name, group)
+                    display_agent_results(
+                        result, agent_name, group, agents_by_name.get(agent_name)
+                    )
             
             with exec_tab3:
                 # Multiple agent selection
-                agent_names = [agent.name for agent in group.agents]
                 selected_agents = st.multiselect(
                     "Select agents to include:",
                     options=agent_names,
@@ -553,115 +679,70 @@ def render_task_executor(group: AgentGroup):
                 if st.button("▶️ Execute with Selected Agents", type="primary"):
                     if not selected_agents:
                         st.warning("Please select at least one agent")
-                            else:
+                    else:
                         with st.spinner(f"Processing with {len(selected_agents)} agents..."):
                             result = execute_with_multiple_agents(group, task, selected_agents)
                         
                         # Store in session state for continuation with history ID
-                        history_id = result.get("history_id", str(uuid.uuid4()))
-                        st.session_state.agent_execution_results = {
-                            "type": "multi_agent",
-                            "task": task,
-                            "result": result,
-                            "agent_names": selected_agents,
-                            "timestamp": datetime.now().isoformat(),
-                            "history_id": history_id
-                        }
+                        _store_execution_results(
+                            "multi_agent", task, result, agent_names=selected_agents
+                        )
                         
                         # Display results
-                        display_directive_results(result, {agent_name: task for agent_name in selected_agents})
+                        display_directive_results(result, dict.fromkeys(selected_agents, task))
     
     # Handle continuation execution
     if in_continuation_mode and execute_button:
         # Store whether to track the continuation chain
         st.session_state.track_chain = track_chain
+        parent_id = parent_execution_id if track_chain else None
         
         with st.spinner("Processing continuation..."):
             # Check if there are directives in the prompt
             if directives:
                 result = execute_task_with_directives(group, task, directives)
                 
-                # Store in session state with history ID
-                history_id = result.get("history_id", str(uuid.uuid4()))
-                st.session_state.agent_execution_results = {
-                    "type": "directive",
-                    "task": task,
-                    "result": result,
-                    "directives": directives,
-                    "timestamp": datetime.now().isoformat(),
-                    "history_id": history_id
-                }
-                
-                # Add parent/child relationship for continuation chains
-                if st.session_state.get("parent_execution_id") and st.session_state.get("track_chain", True):
-                    st.session_state.agent_execution_results["parent_id"] = st.session_state.parent_execution_id
+                # Store in session state with history ID and chain parent
+                _store_execution_results(
+                    "directive", task, result, parent_id, directives=directives
+                )
                 
                 # Display results
                 display_directive_results(result, directives)
             
             # If targeting multiple agents  
-            elif agent_targeting == "multi_agent" and st.session_state.get("selected_agents"):
-                selected_agents = st.session_state.selected_agents
+            elif agent_targeting == "multi_agent" and selected_agents:
                 result = execute_with_multiple_agents(group, task, selected_agents)
                 
-                # Store in session state with history ID
-                history_id = result.get("history_id", str(uuid.uuid4()))
-                st.session_state.agent_execution_results = {
-                    "type": "multi_agent",
-                    "task": task,
-                    "result": result,
-                    "agent_names": selected_agents,
-                    "timestamp": datetime.now().isoformat(),
-                    "history_id": history_id
-                }
-                
-                # Add parent/child relationship for continuation chains
-                if st.session_state.get("parent_execution_id") and st.session_state.get("track_chain", True):
-                    st.session_state.agent_execution_results["parent_id"] = st.session_state.parent_execution_id
+                # Store in session state with history ID and chain parent
+                _store_execution_results(
+                    "multi_agent", task, result, parent_id, agent_names=selected_agents
+                )
                 
                 # Display results
-                display_directive_results(result, {agent_name: task for agent_name in selected_agents})
+                display_directive_results(result, dict.fromkeys(selected_agents, task))
                 
             # If targeting a specific agent
-            elif st.session_state.get("target_agent"):
-                agent_name = st.session_state.target_agent
+            elif target_agent:
+                agent_name = target_agent
                 result = execute_with_agent(group, agent_name, task)
                 
-                # Store in session state with history ID
-                history_id = str(uuid.uuid4())
-                st.session_state.agent_execution_results = {
-                    "type": "single_agent",
-                    "task": task,
-                    "result": result,
-                    "agent_name": agent_name,
-                    "timestamp": datetime.now().isoformat(),
-                    "history_id": history_id
-                }
-                
-                # Add parent/child relationship for continuation chains
-                if st.session_state.get("parent_execution_id") and st.session_state.get("track_chain", True):
-                    st.session_state.agent_execution_results["parent_id"] = st.session_state.parent_execution_id
+                # Store in session state with history ID and chain parent
+                _store_execution_results(
+                    "single_agent", task, result, parent_id, agent_name=agent_name
+                )
                 
                 # Display results
-                display_agent_results(result, agent_name, group)
+                display_agent_results(
+                    result, agent_name, group, agents_by_name.get(agent_name)
+                )
                 
             # Default to manager
-                else:
+            else:
                 result = group.execute_task_with_manager(task)
                 
-                # Store in session state with history ID
-                history_id = str(uuid.uuid4())
-                st.session_state.agent_execution_results = {
-                    "type": "manager",
-                    "task": task,
-                    "result": result,
-                    "timestamp": datetime.now().isoformat(),
-                    "history_id": history_id
-                }
-                
-                # Add parent/child relationship for continuation chains
-                if st.session_state.get("parent_execution_id") and st.session_state.get("track_chain", True):
-                    st.session_state.agent_execution_results["parent_id"] = st.session_state.parent_execution_id
+                # Store in session state with history ID and chain parent
+                _store_execution_results("manager", task, result, parent_id)
                 
                 # Display results
                 display_manager_results(result)
@@ -682,16 +763,22 @@ def render_task_executor(group: AgentGroup):
             st.rerun()
         
         # Display based on result type
-        if results_data["type"] == "manager":
+        result_type = results_data["type"]
+        if result_type == "manager":
             display_manager_results(results_data["result"])
-        elif results_data["type"] == "single_agent":
-            display_agent_results(results_data["result"], results_data["agent_name"], group)
-        elif results_data["type"] == "directive":
+        elif result_type == "single_agent":
+            display_agent_results(
+                results_data["result"],
+                results_data["agent_name"],
+                group,
+                agents_by_name.get(results_data["agent_name"]),
+            )
+        elif result_type == "directive":
             display_directive_results(results_data["result"], results_data.get("directives", {}))
-        elif results_data["type"] == "multi_agent":
+        elif result_type == "multi_agent":
             display_directive_results(
                 results_data["result"], 
-                {agent_name: results_data["task"] for agent_name in results_data.get("agent_names", [])}
+                dict.fromkeys(results_data.get("agent_names", []), results_data["task"])
             )
         
         # Show continuation information if this was a continuation itself
@@ -720,10 +807,10 @@ Continue from here:
                 st.session_state.parent_execution_id = results_data["history_id"]
             
             # Set targeting based on previous execution
-            if results_data["type"] == "single_agent":
+            if result_type == "single_agent":
                 st.session_state.target_agent = results_data["agent_name"]
                 st.session_state.selected_agents = []
-            elif results_data["type"] == "multi_agent":
+            elif result_type == "multi_agent":
                 st.session_state.target_agent = ""
                 st.session_state.selected_agents = results_data.get("agent_names", [])
             else:
@@ -751,11 +838,23 @@ def get_formatted_result(results_data: Dict[str, Any]) -> str:
     return "No result available."
 
 
+def _truncate(text: Optional[str], limit: int) -> str:
+    """Shorten text for a title, adding an ellipsis only when it was cut"""
+    text = text or ""
+    return f"{text[:limit]}..." if len(text) > limit else text
+
+
+@functools.lru_cache(maxsize=None)
+def _format_entry_type(entry_type: str) -> str:
+    """Turn a history entry type such as single_agent_execution into a label"""
+    return entry_type.replace("_", " ").title()
+
+
 def display_manager_results(result: Dict[str, Any]):
     """Display the results from a manager execution."""
     if result.get("status") == "error":
         st.error(f"Error: {result.get('message', 'Unknown error')}")
-                return
+        return
 
     # Display the results in tabs
     plan_tab, results_tab, summary_tab = st.tabs(["Plan", "Results", "Summary"])
@@ -771,7 +870,7 @@ def display_manager_results(result: Dict[str, Any]):
         # Display steps
         st.markdown("### Execution Steps")
         for i, step in enumerate(plan.get("steps", [])):
-            with st.expander(f"Step {i+1}: {step.get('agent')} - {step.get('task')[:50]}..."):
+            with st.expander(f"Step {i+1}: {step.get('agent')} - {_truncate(step.get('task'), 50)}"):
                 st.markdown(f"**Agent**: {step.get('agent')}")
                 st.markdown(f"**Task**: {step.get('task')}")
                 st.markdown(f"**Reason**: {step.get('reason')}")
@@ -782,7 +881,7 @@ def display_manager_results(result: Dict[str, Any]):
             agent_name = agent_result.get("agent")
             agent_data = agent_result.get("result", {})
             
-            with st.expander(f"{agent_name} - {agent_data.get('response', '')[:50]}..."):
+            with st.expander(f"{agent_name} - {_truncate(agent_data.get('response'), 50)}"):
                 # Display response
                 st.markdown("### Response")
                 st.markdown(process_markdown(agent_data.get("response", "No response provided")))
@@ -810,50 +909,66 @@ def display_manager_results(result: Dict[str, Any]):
                 st.markdown(f"- {step}")
 
 
-def display_agent_results(result: Dict[str, Any], agent_name: str, group: AgentGroup):
-    """Display the results from a single agent execution."""
+def display_agent_results(
+    result: Dict[str, Any],
+    agent_name: str,
+    group: AgentGroup,
+    agent: Optional[Agent] = None,
+):
+    """Display the results from a single agent execution.
+
+    The agent is looked up in the group by name unless it is passed in.
+    """
     if result.get("status") == "error":
         st.error(f"Error: {result.get('message', 'Unknown error')}")
         return
     
     st.subheader(f"Results from {agent_name}")
 
-                        # Show detailed agent response
-                        with st.expander("🤖 Agent Response", expanded=True):
-                            st.markdown("### Thought Process")
-                            st.markdown(process_markdown(result["thought_process"]))
+    # Show detailed agent response
+    with st.expander("🤖 Agent Response", expanded=True):
+        st.markdown("### Thought Process")
+        st.markdown(process_markdown(result["thought_process"]))
 
-                            st.markdown("### Response")
-                            st.markdown(process_markdown(result["response"]))
+        st.markdown("### Response")
+        st.markdown(process_markdown(result["response"]))
 
-                            if result.get("tool_calls"):
-                                st.markdown("### Tools Used")
-                                for tool_call in result["tool_calls"]:
-                                    tool_name = tool_call["tool"]
-                                    tool_input = json.dumps(
-                                        tool_call["input"], indent=2
-                                    )
-                                    st.markdown(f"**Tool**: {tool_name}")
-                                    st.markdown(f"```json\n{tool_input}\n```")
+        if result.get("tool_calls"):
+            st.markdown("### Tools Used")
+            for tool_call in result["tool_calls"]:
+                tool_name = tool_call["tool"]
+                tool_input = dumps_json(tool_call["input"], indent=True)
+                st.markdown(f"**Tool**: {tool_name}")
+                st.markdown(f"```json\n{tool_input}\n```")
 
     # Show memory context in a separate expander (not nested)
     with st.expander("💭 Agent Memory", expanded=False):
         # Find the agent to get its memory
-        agent = next((a for a in group.agents if a.name == agent_name), None)
+        if agent is None:
+            agent = group.get_agent(agent_name)
         if agent:
-                            recent_memories = agent.memory[-5:] if agent.memory else []
-                            for memory in recent_memories:
-                                timestamp = memory["timestamp"]
-                                source = memory["source"]
-                                content = memory["content"]
-
-                                st.markdown(f"**{source}** ({timestamp})")
-                                st.markdown(process_markdown(content))
-                                st.markdown("---")
-                    else:
+            recent_memories = agent.memory[-5:] if agent.memory else []
+            for memory in recent_memories:
+                timestamp = memory["timestamp"]
+                source = memory["source"]
+                content = memory["content"]
+
+                st.markdown(f"**{source}** ({timestamp})")
+                st.markdown(process_markdown(content))
+                st.markdown("---")
+        else:
             st.info("No memory found for this agent")
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_json_response(text: str) -> Optional[Any]:
+    """Parse an agent response that looks like JSON, returning None if invalid"""
+    try:
+        return loads_json(text)
+    except (ValueError, TypeError):
+        return None
+
+
 def display_directive_results(result: Dict[str, Any], directives: Dict[str, str]):
     """Display the results from a directive-based execution."""
     if result.get("status") == "error":
@@ -888,11 +1003,10 @@ def display_directive_results(result: Dict[str, Any], directives: Dict[str, str]
                 thought_process = agent_data.get("thought_process", "")
                 
                 # Try to detect if response is a JSON string with thought_process and response
-                if isinstance(response, str) and response.strip().startswith("{") and response.strip().endswith("}"):
-                    try:
-                        # Try to parse JSON response
-                        import json
-                        parsed_json = json.loads(response)
+                if isinstance(response, str):
+                    stripped = response.strip()
+                    if stripped[:1] == "{" and stripped[-1:] == "}":
+                        parsed_json = _parse_json_response(stripped)
                         
                         # Extract fields if they exist
                         if isinstance(parsed_json, dict):
@@ -900,9 +1014,9 @@ def display_directive_results(result: Dict[str, Any], directives: Dict[str, str]
                                 response = parsed_json.get("response", "")
                             if "thought_process" in parsed_json and not thought_process:
                                 thought_process = parsed_json.get("thought_process", "")
-                    except:
-                        # If parsing fails, use the original response
-                        logger.warning(f"Failed to parse JSON response from agent {agent_name}")
+                        else:
+                            # If parsing fails, use the original response
+                            logger.warning(f"Failed to parse JSON response from agent {agent_name}")
                 
                 # Display response
                 st.markdown("#### Response")
@@ -916,42 +1030,218 @@ def display_directive_results(result: Dict[str, Any], directives: Dict[str, str]
             st.markdown("---")
 
 
-def load_agents():
-    """Load saved agent groups from disk"""
-    logger.info("Loading agent groups from disk")
+@st.cache_data(show_spinner=False)
+def _parse_agent_groups(
+    path: str, mtime_ns: int, history_path: str, history_mtime_ns: int
+) -> List[AgentGroup]:
+    """
+    Parse the agent groups file and history log into AgentGroup objects
 
-    data_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-        "app",
-        "data",
-        "agents",
-    )
-    os.makedirs(data_dir, exist_ok=True)
-    logger.info(f"Agent data directory: {data_dir}")
+    Results are cached on the files' modification times, so reruns reuse the
+    parsed groups until either file changes on disk.
+
+    Args:
+        path: Path to the agent groups JSON file
+        mtime_ns: Modification time of the file, used as the cache key
+        history_path: Path to the execution history JSONL file
+        history_mtime_ns: Modification time of the history file, or 0 if
+            it does not exist
 
+    Returns:
+        List of agent groups
+    """
+    with open(path, "rb") as f:
+        data = loads_json(f.read())
+    logger.info(f"Parsed {len(data)} agent groups from {path}")
+
+    # Create agent groups from loaded data, dropping each raw dict
+    # once converted so it can be freed before the next group is built
+    groups = []
+    for i, group_data in enumerate(data):
+        groups.append(AgentGroup.from_dict(group_data))
+        data[i] = None
+
+    if history_mtime_ns:
+        _load_history_entries(history_path, groups)
+
+    return groups
+
+
+def _load_history_entries(history_path: str, groups: List[AgentGroup]):
+    """Distribute the entries of the history log into their groups"""
+    groups_by_id = {group.id: group for group in groups}
+    entry_count = 0
+
+    with open(history_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = loads_json(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"Skipping malformed history record at {history_path}:{line_number}"
+                )
+                continue
+            group = groups_by_id.get(record.get("group_id"))
+            if group is not None:
+                group.execution_history.append(record["entry"])
+                entry_count += 1
+
+    # Keep the same bound that AgentGroup.add_to_history applies
+    for group in groups:
+        if len(group.execution_history) > HISTORY_KEEP_ENTRIES:
+            group.execution_history = group.execution_history[-HISTORY_KEEP_ENTRIES:]
+
+    logger.info(f"Loaded {entry_count} history entries from {history_path}")
+
+
+def append_history_entry(group_id: str, entry: Dict[str, Any]) -> bool:
+    """
+    Append a single execution history entry to the history log
+
+    Args:
+        group_id: ID of the group the entry belongs to
+        entry: The history entry, as added with AgentGroup.add_to_history
+
+    Returns:
+        True if successful, False otherwise
+    """
+    record = dumps_json({"group_id": group_id, "entry": entry})
     try:
-        path = os.path.join(data_dir, "agent_groups.json")
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                logger.info(f"Loaded {len(data)} agent groups from {path}")
+        with _save_lock:
+            with open(AGENT_HISTORY_PATH, "a", encoding="utf-8") as f:
+                f.write(record + "\n")
+        logger.info(f"Appended history entry {entry.get('id')} to {AGENT_HISTORY_PATH}")
+        return True
+    except Exception as e:
+        logger.error(f"Error appending history entry: {str(e)}")
+        logger.info(f"Exception details: {traceback.format_exc()}")
+        return False
 
-                # Clear existing groups if any
-                if "agent_groups" in st.session_state:
-                    st.session_state["agent_groups"] = []
 
-                # Create agent groups from loaded data
-                st.session_state["agent_groups"] = [
-                    AgentGroup.from_dict(group_data) for group_data in data
-                ]
+def _write_history_file(groups: List[AgentGroup]) -> bool:
+    """Write the history log from the execution history of each group"""
+    tmp_path = f"{AGENT_HISTORY_PATH}.tmp"
+    try:
+        # Hold the lock for the whole rewrite, so no entry can be appended to
+        # the old file between taking the snapshot and replacing the file
+        with _save_lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for group in groups:
+                    for entry in group.execution_history:
+                        f.write(
+                            dumps_json({"group_id": group.id, "entry": entry}) + "\n"
+                        )
+            os.replace(tmp_path, AGENT_HISTORY_PATH)
+        logger.info(f"Rewrote history log at {AGENT_HISTORY_PATH}")
+        return True
+    except Exception as e:
+        logger.error(f"Error rewriting history log: {str(e)}")
+        logger.info(f"Exception details: {traceback.format_exc()}")
+        return False
 
-                # Log details of loaded groups
-                for group in st.session_state["agent_groups"]:
-                    logger.info(
+
+def _compact_history_file() -> bool:
+    """
+    Compact the history log on disk, keeping the last HISTORY_KEEP_ENTRIES
+    entries of each group
+
+    The log is read back from the file rather than rebuilt from session
+    state, so entries appended by other sessions are kept.
+    """
+    tmp_path = f"{AGENT_HISTORY_PATH}.tmp"
+    try:
+        # Hold the lock from reading the log until the compacted file
+        # replaces it, so no appended entry is dropped in between
+        with _save_lock:
+            records_by_group: Dict[Any, deque] = defaultdict(
+                lambda: deque(maxlen=HISTORY_KEEP_ENTRIES)
+            )
+            with open(AGENT_HISTORY_PATH, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = loads_json(line)
+                    except json.JSONDecodeError:
+                        continue
+                    records_by_group[record.get("group_id")].append(line)
+
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for records in records_by_group.values():
+                    for line in records:
+                        f.write(line + "\n")
+            os.replace(tmp_path, AGENT_HISTORY_PATH)
+        logger.info(f"Compacted history log at {AGENT_HISTORY_PATH}")
+        return True
+    except Exception as e:
+        logger.error(f"Error compacting history log: {str(e)}")
+        logger.info(f"Exception details: {traceback.format_exc()}")
+        return False
+
+
+def _agent_files_mtime() -> Tuple[int, int]:
+    """Get the modification times of the groups file and history log, 0 if missing"""
+    return tuple(
+        os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        for path in (AGENT_GROUPS_PATH, AGENT_HISTORY_PATH)
+    )
+
+
+def load_agents():
+    """
+    Load saved agent groups from disk
+
+    The groups are re-read whenever the groups file or the history log
+    changes on disk, so edits saved from another session replace the copy in
+    this one rather than being overwritten by it. Reruns with unchanged files
+    keep the groups already in session state.
+    """
+    mtimes = _agent_files_mtime()
+    if (
+        "agent_groups" in st.session_state
+        and st.session_state.get("agent_groups_mtime") == mtimes
+    ):
+        return
+
+    logger.info("Loading agent groups from disk")
+    logger.info(f"Agent data directory: {AGENTS_DATA_DIR}")
+
+    # Write edits still waiting to be saved before reading the files back,
+    # so they are not lost
+    flush_pending_save()
+    mtimes = _agent_files_mtime()
+
+    try:
+        path = AGENT_GROUPS_PATH
+        groups_mtime_ns, history_mtime_ns = mtimes
+        if groups_mtime_ns:
+            history_exists = bool(history_mtime_ns)
+            groups = _parse_agent_groups(
+                path, groups_mtime_ns, AGENT_HISTORY_PATH, history_mtime_ns
+            )
+            logger.info(f"Loaded {len(groups)} agent groups from {path}")
+            st.session_state["agent_groups"] = groups
+            st.session_state["agent_groups_mtime"] = mtimes
+
+            # Files written before the history log existed keep their history
+            # inline; move it to the log and drop it from the groups file
+            if not history_exists and any(g.execution_history for g in groups):
+                logger.info("Migrating inline execution history to the history log")
+                if _write_history_file(groups):
+                    save_agents()
+
+            # Log details of loaded groups
+            if logger.isEnabledFor(logging.DEBUG):
+                for group in groups:
+                    logger.debug(
                         f"Loaded group: {group.name} (ID: {group.id}) with {len(group.agents)} agents"
                     )
                     for agent in group.agents:
-                        logger.info(
+                        logger.debug(
                             f"  - Agent: {agent.name} (ID: {agent.id}, Model: {agent.model})"
                         )
         else:
@@ -960,6 +1250,7 @@ def load_agents():
             )
             # Initialize empty list if file doesn't exist
             st.session_state["agent_groups"] = []
+            st.session_state["agent_groups_mtime"] = mtimes
     except Exception as e:
         logger.error(f"Error loading agent groups: {str(e)}")
         logger.info(f"Exception details: {traceback.format_exc()}")
@@ -967,101 +1258,88 @@ def load_agents():
         st.session_state["agent_groups"] = []
 
 
-def save_agents():
-    """Save agent groups to disk"""
-    logger.info("Saving agent groups to disk")
+def _collect_agent_groups() -> List[Dict[str, Any]]:
+    """Convert the agent groups in session state to serializable dicts"""
+    # Verify that agent_groups exists in session state
+    if "agent_groups" not in st.session_state:
+        logger.warning("No agent_groups in session state, initializing empty list")
+        st.session_state["agent_groups"] = []
 
-    data_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-        "app",
-        "data",
-        "agents",
-    )
+    # Convert groups to dict format
+    data = []
+    for group in st.session_state["agent_groups"]:
+        try:
+            # History is persisted separately in the history log
+            group_dict = group.to_dict()
+            group_dict.pop("execution_history", None)
+            data.append(group_dict)
 
-    try:
-        # Ensure directory exists
-        os.makedirs(data_dir, exist_ok=True)
+            logger.info(
+                f"Saving group: {group.name} (ID: {group.id}) with {len(group.agents)} agents"
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                for agent in group.agents:
+                    logger.debug(
+                        f"  - Agent: {agent.name} (ID: {agent.id}, Model: {agent.model}, "
+                        f"system prompt length: {len(agent.system_prompt)}, tools: {len(agent.tools)})"
+                    )
+        except Exception as e:
+            logger.error(f"Error converting group {group.name} to dict: {str(e)}")
+            logger.info(f"Exception details: {traceback.format_exc()}")
 
-        path = os.path.join(data_dir, "agent_groups.json")
-        logger.info(f"Will save to path: {path}")
+    return data
 
-        # Verify that agent_groups exists in session state
-        if "agent_groups" not in st.session_state:
-            logger.warning("No agent_groups in session state, initializing empty list")
-            st.session_state["agent_groups"] = []
 
-        # Convert groups to dict format
-        data = []
-        for group in st.session_state["agent_groups"]:
-            try:
-                # Log the group and agent IDs before saving
-                logger.info(f"Saving group: {group.name} (ID: {group.id})")
-                for agent in group.agents:
-                    logger.info(
-                        f"  - Saving agent: {agent.name} (ID: {agent.id}, Model: {agent.model})"
-                    )
+def _write_agent_groups(json_data: str, group_count: int) -> bool:
+    """
+    Write serialized agent groups to disk
 
-                group_dict = group.to_dict()
-                data.append(group_dict)
+    Args:
+        json_data: The serialized agent groups
+        group_count: Number of groups in the payload, for logging
 
-                # Log detailed information about each agent for debugging
-                logger.info(
-                    f"Group: {group.name} (ID: {group.id}) has {len(group.agents)} agents"
-                )
-                for agent in group.agents:
-                    logger.info(f"  - Agent: {agent.name} (ID: {agent.id})")
-                    logger.info(f"    Model: {agent.model}")
-                    logger.info(f"    System prompt length: {len(agent.system_prompt)}")
-                    logger.info(f"    Tools: {len(agent.tools)}")
-            except Exception as e:
-                logger.error(f"Error converting group {group.name} to dict: {str(e)}")
-                logger.info(f"Exception details: {traceback.format_exc()}")
+    Returns:
+        True if successful, False otherwise
+    """
+    path = AGENT_GROUPS_PATH
+    logger.info(f"Will save to path: {path}")
 
-        # Log the actual JSON data being saved
-        try:
-            json_data = json.dumps(data, indent=2, ensure_ascii=False)
-            logger.info(
-                f"JSON data to be saved (first 500 chars): {json_data[:500]}..."
-            )
-        except Exception as e:
-            logger.error(f"Error serializing JSON data: {str(e)}")
+    try:
+        # Write to a temporary file with proper encoding
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json_data)
+            # Ensure data is flushed to disk
+            f.flush()
+            os.fsync(f.fileno())
 
-        # Create a backup of the existing file if it exists
+        # Keep the existing file as the backup by linking it rather than
+        # copying it, so the groups file itself is never missing. The link is
+        # made under a temporary name and swapped in, so the old backup stays
+        # in place until the new one exists.
         if os.path.exists(path):
             backup_path = f"{path}.bak"
+            backup_tmp_path = f"{backup_path}.tmp"
             try:
-                import shutil
-
-                shutil.copy2(path, backup_path)
+                if os.path.exists(backup_tmp_path):
+                    os.remove(backup_tmp_path)
+                try:
+                    os.link(path, backup_tmp_path)
+                except OSError:
+                    # Filesystem without hard links
+                    shutil.copy2(path, backup_tmp_path)
+                os.replace(backup_tmp_path, backup_path)
                 logger.info(f"Created backup of agent groups file at {backup_path}")
             except Exception as e:
                 logger.warning(f"Failed to create backup: {str(e)}")
 
-        # Write to file with proper encoding
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            # Ensure data is flushed to disk
-            f.flush()
-            os.fsync(f.fileno())
+        # Atomically swap in the new file
+        os.replace(tmp_path, path)
 
-        # Force a sync to ensure file is written to disk
-        time.sleep(0.1)  # Small delay to ensure file system has time to complete write
+        logger.info(f"Successfully saved {group_count} agent groups to {path}")
 
-        logger.info(f"Successfully saved {len(data)} agent groups to {path}")
-
-        # Verify the file was written correctly
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                saved_data = json.load(f)
-                logger.info(f"Verified saved file contains {len(saved_data)} groups")
-                # Check if the first group has the expected agents
-                if saved_data and saved_data[0]["agents"]:
-                    for agent in saved_data[0]["agents"]:
-                        logger.info(
-                            f"  - Verified agent: {agent['name']} (Model: {agent['model']})"
-                        )
-        except Exception as e:
-            logger.error(f"Error verifying saved file: {str(e)}")
+        # Drop cached parses of the previous file contents
+        _parse_agent_groups.clear()
 
         return True
     except Exception as e:
@@ -1070,11 +1348,100 @@ def save_agents():
         return False
 
 
+def _serialize_agent_groups() -> Optional[Tuple[str, int]]:
+    """Serialize the agent groups in session state, returning None on failure"""
+    try:
+        data = _collect_agent_groups()
+
+        # Compact the history log once it has grown well past what is kept
+        # in memory
+        if (
+            os.path.exists(AGENT_HISTORY_PATH)
+            and os.path.getsize(AGENT_HISTORY_PATH) > HISTORY_COMPACT_BYTES
+        ):
+            _compact_history_file()
+
+        return dumps_json(data, indent=True), len(data)
+    except Exception as e:
+        logger.error(f"Error serializing agent groups: {str(e)}")
+        logger.info(f"Exception details: {traceback.format_exc()}")
+        return None
+
+
+def save_agents():
+    """Save agent groups to disk"""
+    global _pending_save
+
+    logger.info("Saving agent groups to disk")
+
+    payload = _serialize_agent_groups()
+    if payload is None:
+        return False
+
+    with _save_lock:
+        # This save supersedes any pending debounced save
+        _pending_save = None
+        _cancel_save_timer()
+        return _write_agent_groups(*payload)
+
+
+def save_agents_debounced():
+    """
+    Save agent groups to disk after a short delay
+
+    The groups are serialized immediately, but the disk write is deferred by
+    SAVE_DEBOUNCE_SECONDS so that successive UI edits coalesce into a single
+    write. Call flush_pending_save() to force the write.
+    """
+    global _pending_save, _save_timer
+
+    logger.info("Scheduling save of agent groups to disk")
+
+    payload = _serialize_agent_groups()
+    if payload is None:
+        return False
+
+    with _save_lock:
+        _pending_save = payload
+        _cancel_save_timer()
+        _save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, flush_pending_save)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+    return True
+
+
+def flush_pending_save() -> bool:
+    """Write any pending debounced save to disk immediately"""
+    global _pending_save
+
+    # The lock is held for the whole write so an older payload can never
+    # land on disk after a newer one
+    with _save_lock:
+        _cancel_save_timer()
+        payload, _pending_save = _pending_save, None
+        if payload is None:
+            return True
+        return _write_agent_groups(*payload)
+
+
+def _cancel_save_timer():
+    """Cancel the debounced save timer, if any. Must hold _save_lock."""
+    global _save_timer
+
+    if _save_timer is not None:
+        _save_timer.cancel()
+        _save_timer = None
+
+
+atexit.register(flush_pending_save)
+
+
 def execute_with_agent(group: AgentGroup, agent_name: str, task: str) -> Dict[str, Any]:
     """Execute a task with a specific agent."""
     try:
         # Find the agent by name
-        agent = next((a for a in group.agents if a.name == agent_name), None)
+        agent = group.get_agent(agent_name)
         if not agent:
             return {"status": "error", "message": f"Agent '{agent_name}' not found in group '{group.name}'"}
 
@@ -1107,9 +1474,9 @@ def execute_with_agent(group: AgentGroup, agent_name: str, task: str) -> Dict[st
         history_id = group.add_to_history(history_entry)
         logger.info(f"Added execution to history with ID: {history_id}, current history size: {len(group.execution_history)}")
         
-        # Save changes to disk
-        save_agents()
-        logger.info(f"Saved agent groups with updated history to disk")
+        # Append the history entry and schedule a save of the updated memories
+        append_history_entry(group.id, history_entry)
+        save_agents_debounced()
 
         return result
     except Exception as e:
@@ -1123,10 +1490,11 @@ def execute_task_with_directives(group: AgentGroup, task: str, directives: Dict[
     combined_results = []
     agents_involved = []
     start_time = time.time()
+    agents_by_name = group.get_agents_by_name()
     
     for agent_name, subtask in directives.items():
         logger.info(f"Executing directive for agent {agent_name}: {subtask}")
-        agent = next((a for a in group.agents if a.name == agent_name), None)
+        agent = agents_by_name.get(agent_name)
         if not agent:
             combined_results.append({
                 "agent": agent_name,
@@ -1156,14 +1524,15 @@ def execute_task_with_directives(group: AgentGroup, task: str, directives: Dict[
         agents_involved.append(agent_name)
     
     # Combine responses into a single response
-    combined_response = "# Agent Responses\n\n"
+    response_parts = ["# Agent Responses\n\n"]
     for result in combined_results:
         agent_name = result["agent"]
         agent_result = result["result"]
         if agent_result["status"] == "error":
-            combined_response += f"## {agent_name}\n\n❌ Error: {agent_result['message']}\n\n"
+            response_parts.append(f"## {agent_name}\n\n❌ Error: {agent_result['message']}\n\n")
         else:
-            combined_response += f"## {agent_name}\n\n{agent_result['response']}\n\n"
+            response_parts.append(f"## {agent_name}\n\n{agent_result['response']}\n\n")
+    combined_response = "".join(response_parts)
     
     execution_time = time.time() - start_time
     
@@ -1183,9 +1552,9 @@ def execute_task_with_directives(group: AgentGroup, task: str, directives: Dict[
     history_id = group.add_to_history(history_entry)
     logger.info(f"Added directive execution to history with ID: {history_id}, current history size: {len(group.execution_history)}")
     
-    # Save changes to disk
-    save_agents()
-    logger.info(f"Saved agent groups with updated history to disk")
+    # Append the history entry and schedule a save of the updated memories
+    append_history_entry(group.id, history_entry)
+    save_agents_debounced()
     
     return {
         "status": "success",
@@ -1197,6 +1566,15 @@ def execute_task_with_directives(group: AgentGroup, task: str, directives: Dict[
     }
 
 
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: str) -> str:
+    """Format an ISO timestamp for display, returning it unchanged if invalid"""
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return timestamp
+
+
 def render_execution_history(group: AgentGroup):
     """Render the execution history for an agent group."""
     if not group.execution_history:
@@ -1224,27 +1602,25 @@ def render_execution_history(group: AgentGroup):
         sort_options = ["Newest First", "Oldest First"]
         sort_order = st.selectbox("Sort by:", sort_options)
     
+    # Index the history once so parent/child lookups are dict hits
+    by_id, children_by_parent = _index_execution_history(group.execution_history)
+
     # Filter and sort history
-    filtered_history = group.execution_history.copy()
-    
-    # Apply type filter
-    if selected_type != "All Types":
-        type_map = {
-            "Manager": "manager_execution",
-            "Single Agent": "single_agent_execution",
-            "Directive": "directive_execution",
-            "Multi-Agent": "multi_agent_execution"
-        }
-        filter_type = type_map.get(selected_type)
-        if filter_type:
-            filtered_history = [entry for entry in filtered_history if entry.get("type") == filter_type]
-    
-    # Apply agent filter
-    if selected_agent != "All Agents":
-        filtered_history = [
-            entry for entry in filtered_history 
-            if selected_agent in entry.get("agents_involved", [])
-        ]
+    type_map = {
+        "Manager": "manager_execution",
+        "Single Agent": "single_agent_execution",
+        "Directive": "directive_execution",
+        "Multi-Agent": "multi_agent_execution"
+    }
+    filter_type = type_map.get(selected_type)
+    filter_agent = selected_agent if selected_agent != "All Agents" else None
+
+    # Apply both filters in a single pass
+    filtered_history = [
+        entry for entry in group.execution_history
+        if (filter_type is None or entry.get("type") == filter_type)
+        and (filter_agent is None or filter_agent in entry.get("agents_involved", ()))
+    ]
     
     # Apply sorting
     filtered_history.sort(
@@ -1255,8 +1631,17 @@ def render_execution_history(group: AgentGroup):
     # Show history count
     st.markdown(f"**Showing {len(filtered_history)} of {len(group.execution_history)} history entries**")
     
+    # Paginate so only the visible entries are rendered
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.number_input("Entries per page:", min_value=10, max_value=100, value=20, step=10)
+    with col2:
+        page_count = max(1, math.ceil(len(filtered_history) / page_size))
+        page = st.number_input("Page:", min_value=1, max_value=page_count, value=1)
+    page_start = (page - 1) * page_size
+    
     # Display history entries
-    for i, entry in enumerate(filtered_history):
+    for i, entry in enumerate(filtered_history[page_start:page_start + page_size], page_start):
         entry_type = entry.get("type", "unknown")
         timestamp = entry.get("timestamp", "No timestamp")
         task = entry.get("task", "No task")
@@ -1265,32 +1650,24 @@ def render_execution_history(group: AgentGroup):
         
         # Get parent/child relationships
         parent_id = entry.get("parent_id", None)
-        children = [e for e in group.execution_history if e.get("parent_id") == entry_id]
+        children = children_by_parent.get(entry_id, [])
         
         # Format the timestamp to be more readable
-        try:
-            dt = datetime.fromisoformat(timestamp)
-            formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-        except:
-            formatted_time = timestamp
+        formatted_time = _format_timestamp(timestamp)
         
         # Create a unique key for the expander
         expander_key = f"history_{entry_id}"
         
-        # Create title with parent/child info
-        title = f"**{formatted_time}** - "
-        if parent_id:
-            title += "↪️ "  # Indicate this is a continuation
-        if children:
-            title += "⤴️ "  # Indicate this has continuations
-            
-        title += f"{task[:60]}..." if len(task) > 60 else task
+        # Create title with parent/child info: ↪️ marks a continuation,
+        # ⤴️ an entry that has continuations
+        markers = ("↪️ " if parent_id else "") + ("⤴️ " if children else "")
+        title = f"**{formatted_time}** - {markers}{_truncate(task, 60)}"
         
         # Display the entry in an expander
         with st.expander(title):
             st.markdown(f"**ID**: {entry_id}")
             st.markdown(f"**Task**: {task}")
-            st.markdown(f"**Type**: {entry_type.replace('_', ' ').title()}")
+            st.markdown(f"**Type**: {_format_entry_type(entry_type)}")
             st.markdown(f"**Agents Involved**: {agents}")
             st.markdown(f"**Timestamp**: {formatted_time}")
             
@@ -1350,7 +1727,7 @@ def render_execution_history(group: AgentGroup):
                     st.markdown("### Tools Used")
                     for tool_call in result.get("tool_calls", []):
                         tool_name = tool_call.get("tool", "Unknown")
-                        tool_input = json.dumps(tool_call.get("input", {}), indent=2)
+                        tool_input = dumps_json(tool_call.get("input", {}), indent=True)
                         st.markdown(f"**Tool**: {tool_name}")
                         st.markdown(f"```json\n{tool_input}\n```")
             
@@ -1385,7 +1762,9 @@ def render_execution_history(group: AgentGroup):
             with col2:
                 if st.button("View Continuation Chain", key=f"chain_{expander_key}"):
                     # Find all related entries in the chain
-                    chain = get_continuation_chain(group, entry_id)
+                    chain = get_continuation_chain(
+                        group, entry_id, by_id, children_by_parent
+                    )
                     
                     # Display the chain
                     st.markdown("### Continuation Chain")
@@ -1393,49 +1772,67 @@ def render_execution_history(group: AgentGroup):
                         is_current = chain_entry.get("id") == entry_id
                         prefix = "➡️ " if is_current else "   "
                         chain_id = chain_entry.get("id", "Unknown")
-                        chain_type = chain_entry.get("type", "Unknown").replace("_", " ").title()
-                        chain_time = chain_entry.get("timestamp", "")
-                        try:
-                            chain_dt = datetime.fromisoformat(chain_time)
-                            chain_time = chain_dt.strftime("%Y-%m-%d %H:%M:%S")
-                        except:
-                            pass
+                        chain_type = _format_entry_type(chain_entry.get("type", "Unknown"))
+                        chain_time = _format_timestamp(chain_entry.get("timestamp", ""))
                         
                         st.markdown(f"{prefix} **{chain_id}** - {chain_type} - {chain_time}")
 
 
-def get_continuation_chain(group: AgentGroup, entry_id: str) -> List[Dict[str, Any]]:
+def _index_execution_history(
+    history: List[Dict[str, Any]],
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """Index history entries by id and by parent id in a single pass."""
+    by_id: Dict[str, Dict[str, Any]] = {}
+    children_by_parent: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for entry in history:
+        entry_id = entry.get("id")
+        if entry_id:
+            by_id[entry_id] = entry
+        parent_id = entry.get("parent_id")
+        if parent_id:
+            children_by_parent[parent_id].append(entry)
+    return by_id, children_by_parent
+
+
+def get_continuation_chain(
+    group: AgentGroup,
+    entry_id: str,
+    by_id: Optional[Dict[str, Dict[str, Any]]] = None,
+    children_by_parent: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
     """Get all entries in a continuation chain, including parents and children."""
-    chain = []
-    
+    if by_id is None or children_by_parent is None:
+        by_id, children_by_parent = _index_execution_history(group.execution_history)
+
     # Find the entry
-    entry = next((e for e in group.execution_history if e.get("id") == entry_id), None)
+    entry = by_id.get(entry_id)
     if not entry:
-        return chain
-    
-    # Add the entry
-    chain.append(entry)
-    
-    # Recursively add parents
+        return []
+
+    visited = {entry_id}
+
+    # Walk up the parents, adding them at the start
+    parents = []
     parent_id = entry.get("parent_id")
-    if parent_id:
-        parent_entry = next((e for e in group.execution_history if e.get("id") == parent_id), None)
-        if parent_entry:
-            parent_chain = get_continuation_chain(group, parent_id)
-            # Add parents at the start
-            for parent in parent_chain:
-                if parent not in chain:
-                    chain.insert(0, parent)
-    
-    # Add children
-    children = [e for e in group.execution_history if e.get("parent_id") == entry_id]
-    for child in children:
-        child_chain = get_continuation_chain(group, child.get("id"))
-        # Add children at the end
-        for child_entry in child_chain:
-            if child_entry not in chain:
-                chain.append(child_entry)
-    
+    while parent_id and parent_id not in visited and parent_id in by_id:
+        visited.add(parent_id)
+        parent_entry = by_id[parent_id]
+        parents.append(parent_entry)
+        parent_id = parent_entry.get("parent_id")
+    chain = parents[::-1]
+    chain.append(entry)
+
+    # Add children (and their continuations) at the end, breadth first
+    queue = deque(children_by_parent.get(entry_id, []))
+    while queue:
+        child = queue.popleft()
+        child_id = child.get("id")
+        if child_id in visited:
+            continue
+        visited.add(child_id)
+        chain.append(child)
+        queue.extend(children_by_parent.get(child_id, []))
+
     return chain
 
 
@@ -1501,11 +1898,33 @@ def execute_with_multiple_agents(group: AgentGroup, task: str, agent_names: List
     combined_results = []
     start_time = time.time()
     
-    for agent_name in agent_names:
-        logger.info(f"Executing task with agent {agent_name}: {task}")
-        
-        # Find the agent by name
-        agent = next((a for a in group.agents if a.name == agent_name), None)
+    # Find the agents by name
+    agents_by_name = group.get_agents_by_name()
+    resolved_agents = [
+        (agent_name, agents_by_name.get(agent_name)) for agent_name in agent_names
+    ]
+    
+    # Report unknown names before any model call is made
+    missing_agents = [name for name, agent in resolved_agents if not agent]
+    if missing_agents:
+        logger.warning(
+            f"Agents not found in group '{group.name}': {', '.join(missing_agents)}"
+        )
+
+    # Each agent spends its time waiting on the model, so run them concurrently
+    futures = {}
+    found_agents = [(name, agent) for name, agent in resolved_agents if agent]
+    if found_agents:
+        with ThreadPoolExecutor(
+            max_workers=min(len(found_agents), MAX_PARALLEL_AGENTS)
+        ) as executor:
+            for agent_name, agent in found_agents:
+                logger.info(f"Executing task with agent {agent_name}: {task}")
+                futures[agent_name] = executor.submit(agent.execute_task, task)
+    
+    # Record the results in the original order; memory updates stay on this
+    # thread since they mutate shared state
+    for agent_name, agent in resolved_agents:
         if not agent:
             combined_results.append({
                 "agent": agent_name,
@@ -1516,8 +1935,7 @@ def execute_with_multiple_agents(group: AgentGroup, task: str, agent_names: List
             })
             continue
         
-        # Execute with this agent
-        agent_result = agent.execute_task(task)
+        agent_result = futures[agent_name].result()
         
         # Add to agent memory
         agent.add_to_memory(f"Task: {task}\nResponse: {agent_result['response']}", "execution")
@@ -1534,31 +1952,32 @@ def execute_with_multiple_agents(group: AgentGroup, task: str, agent_names: List
         })
     
     # Combine responses into a single response
-    combined_response = "# Agent Responses\n\n"
+    response_parts = ["# Agent Responses\n\n"]
     for result in combined_results:
         agent_name = result["agent"]
         agent_result = result["result"]
         if agent_result["status"] == "error":
-            combined_response += f"## {agent_name}\n\n❌ Error: {agent_result['message']}\n\n"
+            response_parts.append(f"## {agent_name}\n\n❌ Error: {agent_result['message']}\n\n")
         else:
             # Process the response (handle JSON format if needed)
             response = agent_result.get("response", "No response provided")
             
             # Try to detect if response is a JSON string with thought_process and response
-            if isinstance(response, str) and response.strip().startswith("{") and response.strip().endswith("}"):
-                try:
-                    # Try to parse JSON response
-                    import json
-                    parsed_json = json.loads(response)
+            if isinstance(response, str):
+                stripped = response.strip()
+                if stripped[:1] == "{" and stripped[-1:] == "}":
+                    parsed_json = _parse_json_response(stripped)
                     
                     # Extract response if it exists
-                    if isinstance(parsed_json, dict) and "response" in parsed_json:
-                        response = parsed_json.get("response", "")
-                except:
-                    # If parsing fails, use the original response
-                    logger.warning(f"Failed to parse JSON response from agent {agent_name}")
+                    if isinstance(parsed_json, dict):
+                        if "response" in parsed_json:
+                            response = parsed_json.get("response", "")
+                    else:
+                        # If parsing fails, use the original response
+                        logger.warning(f"Failed to parse JSON response from agent {agent_name}")
             
-            combined_response += f"## {agent_name}\n\n{response}\n\n"
+            response_parts.append(f"## {agent_name}\n\n{response}\n\n")
+    combined_response = "".join(response_parts)
     
     execution_time = time.time() - start_time
     
@@ -1582,9 +2001,9 @@ def execute_with_multiple_agents(group: AgentGroup, task: str, agent_names: List
     history_id = group.add_to_history(history_entry)
     logger.info(f"Added multi-agent execution to history with ID: {history_id}, current history size: {len(group.execution_history)}")
     
-    # Save changes to disk
-    save_agents()
-    logger.info(f"Saved agent groups with updated history to disk")
+    # Append the history entry and schedule a save of the updated memories
+    append_history_entry(group.id, history_entry)
+    save_agents_debounced()
     
     return {
         "status": "success",
@@ -1,10 +1,102 @@
-import json
+import atexit
+import copy
 import os
 import logging
 import datetime
-from typing import List, Dict, Any, Optional, Union
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
 import streamlit as st
 
+from app.utils.json_utils import dumps_json, loads_json
+
+# Delay before a debounced chat save is written to disk
+CHAT_SAVE_DEBOUNCE_SECONDS = 0.5
+
+# Chats with messages not yet written to disk, keyed by chat ID, holding the
+# file path and a snapshot of the chat to write. Kept at module level because
+# a new ChatManager is created on every rerun.
+_pending_chats: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+_save_timer: Optional[threading.Timer] = None
+_save_lock = threading.RLock()
+
+# Message roles passed on to the model; others (such as tool messages) are
+# only kept for display
+API_ROLES = frozenset({"user", "assistant", "system"})
+
+# Suffix of the sidecar file holding a chat's listing metadata
+CHAT_META_SUFFIX = ".meta.json"
+
+
+def _chat_metadata(chat_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the fields shown in the chat list from a chat"""
+    return {
+        "id": chat_data.get("id"),
+        "title": chat_data.get("title"),
+        "created_at": chat_data.get("created_at"),
+        "updated_at": chat_data.get("updated_at"),
+        "message_count": len(chat_data.get("messages", [])),
+    }
+
+
+def _meta_path(file_path: str) -> str:
+    """Get the path of the metadata sidecar for a chat file"""
+    return os.path.splitext(file_path)[0] + CHAT_META_SUFFIX
+
+
+def _atomic_write(path: str, text: str) -> None:
+    """Write text to a temporary file and atomically move it over path"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_chat_file(file_path: str, chat_data: Dict[str, Any]) -> bool:
+    """
+    Write a chat to disk
+
+    Args:
+        file_path: Path of the chat file
+        chat_data: The chat to write
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        _atomic_write(file_path, dumps_json(chat_data, indent=True))
+        # Written after the chat so it is never newer than the chat it describes
+        _atomic_write(_meta_path(file_path), dumps_json(_chat_metadata(chat_data)))
+        logging.info(f"Saved chat {chat_data.get('id')} to {file_path}")
+        return True
+    except Exception as e:
+        logging.error(f"Error saving chat {chat_data.get('id')}: {str(e)}")
+        return False
+
+
+def flush_pending_chats() -> bool:
+    """
+    Write all chats with pending debounced saves to disk immediately
+
+    Returns:
+        True if every pending chat was written, False otherwise
+    """
+    global _save_timer
+
+    with _save_lock:
+        if _save_timer is not None:
+            _save_timer.cancel()
+            _save_timer = None
+        pending = list(_pending_chats.values())
+        _pending_chats.clear()
+        # Write every chat even if an earlier one fails
+        results = [_write_chat_file(path, data) for path, data in pending]
+        return all(results)
+
+
+atexit.register(flush_pending_chats)
+
 
 class ChatManager:
     """Manages chat conversations, including saving and loading"""
@@ -31,6 +123,11 @@ class ChatManager:
         if "chat_history" not in st.session_state:
             st.session_state.chat_history = []
 
+        # API-shaped messages per chat, with the number of stored messages
+        # they were built from, so only new messages need converting
+        if "api_messages_cache" not in st.session_state:
+            st.session_state.api_messages_cache = {}
+
     def create_new_chat(self, title: Optional[str] = None) -> str:
         """
         Create a new chat session
@@ -41,7 +138,19 @@ class ChatManager:
         Returns:
             The ID of the new chat
         """
-        chat_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.datetime.now()
+        now_iso = now.isoformat()
+        base_id = now.strftime("%Y%m%d_%H%M%S")
+        chat_id = base_id
+
+        # Chats created within the same second would otherwise share an ID and
+        # overwrite each other, both in the session and on disk
+        suffix = 1
+        while chat_id in st.session_state.chats or os.path.exists(
+            os.path.join(self.chats_dir, f"{chat_id}.json")
+        ):
+            chat_id = f"{base_id}_{suffix}"
+            suffix += 1
 
         if not title:
             title = f"Chat {chat_id}"
@@ -49,8 +158,8 @@ class ChatManager:
         st.session_state.chats[chat_id] = {
             "id": chat_id,
             "title": title,
-            "created_at": datetime.datetime.now().isoformat(),
-            "updated_at": datetime.datetime.now().isoformat(),
+            "created_at": now_iso,
+            "updated_at": now_iso,
             "messages": [],
         }
 
@@ -81,15 +190,51 @@ class ChatManager:
 
         file_path = os.path.join(self.chats_dir, f"{chat_id}.json")
 
-        try:
-            with open(file_path, "w") as f:
-                json.dump(chat_data, f, indent=2)
-            logging.info(f"Saved chat {chat_id} to {file_path}")
-            return True
-        except Exception as e:
-            logging.error(f"Error saving chat {chat_id}: {str(e)}")
+        with _save_lock:
+            # This save supersedes any pending debounced save of the chat
+            _pending_chats.pop(chat_id, None)
+            return _write_chat_file(file_path, chat_data)
+
+    def save_chat_debounced(self, chat_id: Optional[str] = None) -> bool:
+        """
+        Save a chat to disk after a short delay
+
+        Successive calls within CHAT_SAVE_DEBOUNCE_SECONDS coalesce into a
+        single write. Call flush_pending_chats() to force the write.
+
+        Args:
+            chat_id: ID of chat to save, or current chat if None
+
+        Returns:
+            True if the save was scheduled, False otherwise
+        """
+        global _save_timer
+
+        if not chat_id:
+            chat_id = st.session_state.current_chat_id
+
+        if not chat_id or chat_id not in st.session_state.chats:
+            logging.error(f"Invalid chat ID: {chat_id}")
             return False
 
+        file_path = os.path.join(self.chats_dir, f"{chat_id}.json")
+
+        # The timer thread writes the chat later while this thread keeps
+        # changing it, so queue a copy of its current state
+        chat_data = copy.deepcopy(st.session_state.chats[chat_id])
+
+        with _save_lock:
+            _pending_chats[chat_id] = (file_path, chat_data)
+            if _save_timer is not None:
+                _save_timer.cancel()
+            _save_timer = threading.Timer(
+                CHAT_SAVE_DEBOUNCE_SECONDS, flush_pending_chats
+            )
+            _save_timer.daemon = True
+            _save_timer.start()
+
+        return True
+
     def list_saved_chats(self) -> List[Dict[str, Any]]:
         """
         List all saved chats
@@ -99,26 +244,37 @@ class ChatManager:
         """
         chats = []
 
+        # Make sure the listing reflects messages not yet written
+        flush_pending_chats()
+
         try:
-            for filename in os.listdir(self.chats_dir):
-                if filename.endswith(".json"):
-                    file_path = os.path.join(self.chats_dir, filename)
-                    try:
-                        with open(file_path, "r") as f:
-                            chat_data = json.load(f)
-                            chats.append(
-                                {
-                                    "id": chat_data.get("id"),
-                                    "title": chat_data.get("title"),
-                                    "created_at": chat_data.get("created_at"),
-                                    "updated_at": chat_data.get("updated_at"),
-                                    "message_count": len(chat_data.get("messages", [])),
-                                }
-                            )
-                    except Exception as e:
-                        logging.error(f"Error reading chat file {filename}: {str(e)}")
+            entries = {
+                entry.name: entry
+                for entry in os.scandir(self.chats_dir)
+                if entry.name.endswith(".json")
+            }
         except Exception as e:
             logging.error(f"Error listing chats: {str(e)}")
+            entries = {}
+
+        for filename, entry in entries.items():
+            if filename.endswith(CHAT_META_SUFFIX):
+                continue
+            try:
+                # Read the small metadata sidecar when it is up to date, and
+                # fall back to the full chat for files saved without one
+                meta_entry = entries.get(_meta_path(filename))
+                if (
+                    meta_entry is not None
+                    and meta_entry.stat().st_mtime_ns >= entry.stat().st_mtime_ns
+                ):
+                    with open(meta_entry.path, "rb") as f:
+                        chats.append(loads_json(f.read()))
+                else:
+                    with open(entry.path, "rb") as f:
+                        chats.append(_chat_metadata(loads_json(f.read())))
+            except Exception as e:
+                logging.error(f"Error reading chat file {filename}: {str(e)}")
 
         # Sort by updated_at descending
         chats.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
@@ -137,11 +293,15 @@ class ChatManager:
         """
         file_path = os.path.join(self.chats_dir, f"{chat_id}.json")
 
+        # Make sure any unsaved messages of the chat are on disk first
+        flush_pending_chats()
+
         try:
-            with open(file_path, "r") as f:
-                chat_data = json.load(f)
+            with open(file_path, "rb") as f:
+                chat_data = loads_json(f.read())
 
             st.session_state.chats[chat_id] = chat_data
+            self._invalidate_api_messages(chat_id)
             st.session_state.current_chat_id = chat_id
             st.session_state.chat_history = chat_data.get("messages", [])
 
@@ -164,18 +324,24 @@ class ChatManager:
         file_path = os.path.join(self.chats_dir, f"{chat_id}.json")
 
         try:
+            # Drop any pending save so the file is not written again
+            with _save_lock:
+                _pending_chats.pop(chat_id, None)
+
             # Remove from memory
             if chat_id in st.session_state.chats:
                 del st.session_state.chats[chat_id]
+            self._invalidate_api_messages(chat_id)
 
             # If current chat is being deleted, reset current chat
             if st.session_state.current_chat_id == chat_id:
                 st.session_state.current_chat_id = None
                 st.session_state.chat_history = []
 
-            # Remove file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            # Remove the chat file and its metadata sidecar
+            for path in (file_path, _meta_path(file_path)):
+                if os.path.exists(path):
+                    os.remove(path)
 
             logging.info(f"Deleted chat {chat_id}")
             return True
@@ -208,10 +374,11 @@ class ChatManager:
             logging.error(f"Invalid chat ID: {chat_id}")
             return False
 
+        now_iso = datetime.datetime.now().isoformat()
         message = {
             "role": role,
             "content": content,
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": now_iso,
         }
 
         # Add to in-memory chat
@@ -219,12 +386,10 @@ class ChatManager:
         st.session_state.chat_history.append(message)
 
         # Update timestamp
-        st.session_state.chats[chat_id][
-            "updated_at"
-        ] = datetime.datetime.now().isoformat()
+        st.session_state.chats[chat_id]["updated_at"] = now_iso
 
-        # Auto-save chat
-        self.save_chat(chat_id)
+        # Auto-save chat; bursts of messages coalesce into one write
+        self.save_chat_debounced(chat_id)
 
         return True
 
@@ -246,14 +411,28 @@ class ChatManager:
         if not chat_id or chat_id not in st.session_state.chats:
             return []
 
-        # Convert to format needed for API ({role, content} only)
-        messages = []
-        for msg in st.session_state.chats[chat_id]["messages"]:
-            if msg.get("role") in ["user", "assistant", "system"]:
-                content = msg["content"]
-                messages.append({"role": msg["role"], "content": content})
+        stored_messages = st.session_state.chats[chat_id]["messages"]
+        converted_count, messages = st.session_state.api_messages_cache.get(
+            chat_id, (0, [])
+        )
+        if converted_count > len(stored_messages):
+            # Messages were removed; start over
+            converted_count, messages = 0, []
+
+        # Convert new messages to format needed for API ({role, content} only)
+        for msg in stored_messages[converted_count:]:
+            role = msg.get("role")
+            if role in API_ROLES:
+                messages.append({"role": role, "content": msg["content"]})
 
-        return messages
+        st.session_state.api_messages_cache[chat_id] = (len(stored_messages), messages)
+
+        # Return a copy, since callers may insert a system prompt
+        return list(messages)
+
+    def _invalidate_api_messages(self, chat_id: str) -> None:
+        """Drop the API-shaped messages of a chat after its messages change"""
+        st.session_state.api_messages_cache.pop(chat_id, None)
 
     def get_current_chat_title(self) -> str:
         """Get the title of the current chat"""
@@ -294,20 +473,19 @@ class ChatManager:
             return False
 
         # Add timestamp if not present
+        now_iso = datetime.datetime.now().isoformat()
         if "timestamp" not in message:
-            message["timestamp"] = datetime.datetime.now().isoformat()
+            message["timestamp"] = now_iso
 
         # Add to in-memory chat
         st.session_state.chats[chat_id]["messages"].append(message)
         st.session_state.chat_history.append(message)
 
         # Update timestamp
-        st.session_state.chats[chat_id][
-            "updated_at"
-        ] = datetime.datetime.now().isoformat()
+        st.session_state.chats[chat_id]["updated_at"] = now_iso
 
-        # Auto-save chat
-        self.save_chat(chat_id)
+        # Auto-save chat; bursts of messages coalesce into one write
+        self.save_chat_debounced(chat_id)
 
         return True
 
@@ -333,11 +511,13 @@ class ChatManager:
             return ""
 
         # Create a placeholder message
-        message_id = f"stream_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        now = datetime.datetime.now()
+        now_iso = now.isoformat()
+        message_id = f"stream_{now.strftime('%Y%m%d_%H%M%S')}"
         message = {
             "role": "assistant",
             "content": "",  # Start empty
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": now_iso,
             "id": message_id,
             "is_streaming": True,
         }
@@ -347,9 +527,7 @@ class ChatManager:
         st.session_state.chat_history.append(message)
 
         # Update timestamp
-        st.session_state.chats[chat_id][
-            "updated_at"
-        ] = datetime.datetime.now().isoformat()
+        st.session_state.chats[chat_id]["updated_at"] = now_iso
 
         return message_id
 
@@ -385,6 +563,8 @@ class ChatManager:
                 # Update the message content
                 st.session_state.chats[chat_id]["messages"][i]["content"] = content
                 st.session_state.chats[chat_id]["messages"][i]["is_streaming"] = False
+                # The API-shaped copy of the message is now out of date
+                self._invalidate_api_messages(chat_id)
                 found = True
                 break
 
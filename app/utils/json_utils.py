@@ -0,0 +1,51 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Stdlib encoders used when orjson is not installed, built once instead of
+# on every json.dumps call
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_JSON_INDENT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def dumps_json(data: Any, indent: bool = False) -> str:
+    """
+    Serialize data to a JSON string
+
+    Args:
+        data: The data to serialize
+        indent: Whether to indent the output by two spaces
+
+    Returns:
+        The JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode(
+            "utf-8"
+        )
+    return (_JSON_INDENT_ENCODER if indent else _JSON_ENCODER).encode(data)
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document
+
+    Args:
+        data: The JSON document to parse, as a string or as UTF-8 bytes read
+            straight from a file (which skips decoding to str first)
+
+    Returns:
+        The parsed data
+
+    Raises:
+        json.JSONDecodeError: If the string is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,7 +1,9 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-import traceback
 from datetime import datetime
 from functools import wraps
 from typing import Any, Callable, Dict, Optional, Type, TypeVar, cast
@@ -28,26 +30,54 @@ LOG_LEVELS = {
 }
 LOG_LEVEL = LOG_LEVELS.get(LOG_LEVEL_ENV, logging.INFO)
 
+# Set OLLAMA_UI_NO_WRAP to skip the exception_handler wrapper entirely
+NO_WRAP = bool(os.environ.get("OLLAMA_UI_NO_WRAP"))
+
 # Configure logging
 logger = logging.getLogger("ollama_ui")
 logger.setLevel(LOG_LEVEL)
 
-# Create file handler
-file_handler = logging.FileHandler(LOG_FILE_PATH)
-file_handler.setLevel(LOG_LEVEL)
 
-# Create console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(LOG_LEVEL)
+def _configure_handlers() -> None:
+    """Attach the file and console handlers to the application logger"""
+    # Create file handler. Records reach it through a queue, so the file is
+    # written on the listener's thread and logging calls don't wait on it.
+    # Each record is still written as it arrives, so the Logs page, which
+    # reads the file directly, stays current
+    file_handler = logging.FileHandler(LOG_FILE_PATH)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(LOG_LEVEL)
+    queue_listener = logging.handlers.QueueListener(log_queue, file_handler)
+
+    # Create console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(LOG_LEVEL)
+
+    # Create formatter
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    # Add handlers to logger
+    logger.addHandler(queue_handler)
+    logger.addHandler(console_handler)
+    queue_listener.start()
 
-# Create formatter
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+    def shutdown() -> None:
+        """Drain the log queue and close the log file"""
+        queue_listener.stop()
+        file_handler.close()
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+    atexit.register(shutdown)
+
+
+# Attach handlers only once, so re-executing this module (for example when
+# Streamlit reloads changed sources) does not emit every record twice
+if not logger.handlers:
+    _configure_handlers()
 
 # Log the current configuration
 logger.info(f"Logger initialized with level: {LOG_LEVEL_ENV}")
@@ -90,8 +120,8 @@ def log_exception(e: Exception, context: str = "") -> str:
         A formatted error message
     """
     error_msg = f"{context}: {str(e)}" if context else str(e)
-    logger.error(error_msg)
-    logger.error(traceback.format_exc())
+    # Let the handlers format the traceback, and only if the record is emitted
+    logger.error(error_msg, exc_info=e)
     return error_msg
 
 
@@ -103,16 +133,19 @@ def exception_handler(func: F) -> F:
         func: The function to decorate
 
     Returns:
-        The decorated function
+        The decorated function, or func itself when NO_WRAP is set
     """
+    if NO_WRAP:
+        return func
+
+    # Get function name for context
+    func_name = func.__qualname__
 
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            # Get function name for context
-            func_name = func.__qualname__
             # Log the exception
             error_msg = log_exception(e, f"Error in {func_name}")
             # Re-raise the exception with the logged message
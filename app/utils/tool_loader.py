@@ -4,15 +4,33 @@ import importlib
 import inspect
 import json
 import os
+import re
 import sys
 from typing import Any, Dict, List, Callable, Optional, Tuple, Union
 import streamlit as st
 
+from app.utils.json_utils import dumps_json, loads_json
 from app.utils.logger import get_logger
 
 # Get application logger
 logger = get_logger()
 
+# The tools directory never moves, so resolve it once
+TOOLS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"
+)
+
+# Set once the tools directory is known to exist
+_tools_dir_ready = False
+
+# Characters not allowed in tool file names; each is replaced by "_"
+_UNSAFE_NAME_CHARS_RE = re.compile(r"\W")
+
+
+def _sanitize_tool_name(tool_name: str) -> str:
+    """Turn a tool name into the name of its files, without extension"""
+    return _UNSAFE_NAME_CHARS_RE.sub("_", tool_name)
+
 
 class ToolLoader:
     """Utility for loading and managing tool implementations."""
@@ -20,19 +38,22 @@ class ToolLoader:
     @staticmethod
     def get_tools_dir() -> str:
         """Get the absolute path to the tools directory."""
-        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        tools_dir = os.path.join(app_dir, "tools")
-        return tools_dir
+        return TOOLS_DIR
 
     @staticmethod
     def ensure_tools_dir_exists() -> None:
         """Ensure the tools directory exists."""
-        tools_dir = ToolLoader.get_tools_dir()
+        global _tools_dir_ready
+        if _tools_dir_ready:
+            return
+
+        tools_dir = TOOLS_DIR
         if not os.path.exists(tools_dir):
             os.makedirs(tools_dir)
             # Create an __init__.py file to make it a proper Python package
             with open(os.path.join(tools_dir, "__init__.py"), "w") as f:
                 f.write('"""Tools package for Ollama UI."""\n')
+        _tools_dir_ready = True
 
     @staticmethod
     def save_tool_implementation(tool_name: str, code: str) -> str:
@@ -50,7 +71,7 @@ class ToolLoader:
         tools_dir = ToolLoader.get_tools_dir()
 
         # Sanitize tool name for filename
-        sanitized_name = "".join(c if c.isalnum() else "_" for c in tool_name)
+        sanitized_name = _sanitize_tool_name(tool_name)
         file_path = os.path.join(tools_dir, f"{sanitized_name}.py")
 
         with open(file_path, "w") as f:
@@ -74,19 +95,18 @@ class ToolLoader:
         tools_dir = ToolLoader.get_tools_dir()
 
         # Sanitize tool name for filename
-        sanitized_name = "".join(c if c.isalnum() else "_" for c in tool_name)
+        sanitized_name = _sanitize_tool_name(tool_name)
         file_path = os.path.join(tools_dir, f"{sanitized_name}.py")
 
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r") as f:
-                    return f.read()
-            except Exception as e:
-                logger.error(f"Error reading tool implementation {file_path}: {str(e)}")
-                return None
-        else:
+        try:
+            with open(file_path, "r") as f:
+                return f.read()
+        except FileNotFoundError:
             logger.warning(f"Tool implementation file not found: {file_path}")
             return None
+        except Exception as e:
+            logger.error(f"Error reading tool implementation {file_path}: {str(e)}")
+            return None
 
     @staticmethod
     def save_tool_definition(tool_name: str, tool_definition: Dict[str, Any]) -> str:
@@ -104,11 +124,11 @@ class ToolLoader:
         tools_dir = ToolLoader.get_tools_dir()
 
         # Sanitize tool name for filename
-        sanitized_name = "".join(c if c.isalnum() else "_" for c in tool_name)
+        sanitized_name = _sanitize_tool_name(tool_name)
         file_path = os.path.join(tools_dir, f"{sanitized_name}.json")
 
-        with open(file_path, "w") as f:
-            json.dump(tool_definition, f, indent=2)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(dumps_json(tool_definition, indent=True))
 
         logger.info(f"Saved tool definition to {file_path}")
         return file_path
@@ -121,16 +141,31 @@ class ToolLoader:
         Returns:
             List of tool names
         """
+        tool_files, _ = ToolLoader._scan_tools_dir()
+        return list(tool_files)
+
+    @staticmethod
+    def _scan_tools_dir() -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Scan the tools directory once.
+
+        Returns:
+            Tuple of (implementation mtimes by tool name, definition mtimes by
+            tool name), in nanoseconds
+        """
         ToolLoader.ensure_tools_dir_exists()
-        tools_dir = ToolLoader.get_tools_dir()
 
-        tool_files = [
-            os.path.splitext(f)[0]
-            for f in os.listdir(tools_dir)
-            if f.endswith(".py") and f != "__init__.py"
-        ]
+        tool_files = {}
+        definition_files = {}
+        with os.scandir(TOOLS_DIR) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                if ext == ".py" and entry.name != "__init__.py":
+                    tool_files[name] = entry.stat().st_mtime_ns
+                elif ext == ".json":
+                    definition_files[name] = entry.stat().st_mtime_ns
 
-        return tool_files
+        return tool_files, definition_files
 
     @staticmethod
     def load_tool_function(
@@ -149,42 +184,72 @@ class ToolLoader:
         tools_dir = ToolLoader.get_tools_dir()
 
         # Sanitize tool name for filename
-        sanitized_name = "".join(c if c.isalnum() else "_" for c in tool_name)
+        sanitized_name = _sanitize_tool_name(tool_name)
         py_file = os.path.join(tools_dir, f"{sanitized_name}.py")
         json_file = os.path.join(tools_dir, f"{sanitized_name}.json")
 
         # Check if files exist
-        if not os.path.exists(py_file):
+        try:
+            py_mtime_ns = os.stat(py_file).st_mtime_ns
+        except FileNotFoundError:
             logger.warning(f"Tool implementation file not found: {py_file}")
             return None, None
 
+        try:
+            json_mtime_ns = os.stat(json_file).st_mtime_ns
+        except FileNotFoundError:
+            json_mtime_ns = None
+
+        return ToolLoader._load_tool(
+            tool_name, sanitized_name, py_mtime_ns, json_mtime_ns
+        )
+
+    @staticmethod
+    @st.cache_resource(show_spinner=False)
+    def _load_tool(
+        tool_name: str,
+        sanitized_name: str,
+        py_mtime_ns: int,
+        json_mtime_ns: Optional[int],
+    ) -> Tuple[Optional[Callable], Optional[Dict[str, Any]]]:
+        """
+        Load a tool whose implementation file is known to exist.
+
+        Cached per process and keyed on the files' modification times, so a
+        tool is only imported and parsed again after one of its files changes.
+
+        Args:
+            tool_name: Name of the tool
+            sanitized_name: Name of the tool's files without extension
+            py_mtime_ns: Modification time of the implementation file
+            json_mtime_ns: Modification time of the definition file, or None
+                if the tool has no definition file
+
+        Returns:
+            Tuple of (function, definition) or (None, None) if not loadable
+        """
+        tools_dir = TOOLS_DIR
+        json_file = os.path.join(tools_dir, f"{sanitized_name}.json")
+
         # Load the definition if it exists
         definition = None
-        if os.path.exists(json_file):
-            with open(json_file, "r") as f:
+        if json_mtime_ns is not None:
+            with open(json_file, "rb") as f:
                 try:
-                    definition = json.load(f)
+                    definition = loads_json(f.read())
                 except json.JSONDecodeError:
                     logger.error(f"Invalid JSON in tool definition: {json_file}")
 
-        # Add the tools directory to the Python path if it's not already there
-        if tools_dir not in sys.path:
-            sys.path.append(os.path.dirname(tools_dir))  # Add app directory
-
         try:
-            # Import the module dynamically
+            # Tools live in the app.tools package, which is importable wherever
+            # this module is. An already imported module is reloaded, since
+            # its file may have changed since it was cached
             module_name = f"app.tools.{sanitized_name}"
-
-            # First, try to import directly
-            try:
+            module = sys.modules.get(module_name)
+            if module is None:
                 module = importlib.import_module(module_name)
-            except ImportError:
-                # If that fails, try to reload if it's already imported
-                if module_name in sys.modules:
-                    module = importlib.reload(sys.modules[module_name])
-                else:
-                    # Try importing with just the filename
-                    module = importlib.import_module(sanitized_name)
+            else:
+                module = importlib.reload(module)
 
             # Find the function either by name from definition or first defined function
             function = None
@@ -200,9 +265,15 @@ class ToolLoader:
                     if callable(function):
                         return function, definition
 
-            # If function not found by name, try to find the first defined function
-            for name, obj in inspect.getmembers(module, inspect.isfunction):
-                if name != "__init__":
+            # If function not found by name, take the first public function
+            # defined in the module itself, in definition order. Functions
+            # imported from elsewhere are skipped
+            for name, obj in vars(module).items():
+                if (
+                    not name.startswith("_")
+                    and inspect.isfunction(obj)
+                    and obj.__module__ == module.__name__
+                ):
                     function = obj
 
                     # If no definition exists, generate one based on function metadata
@@ -221,25 +292,49 @@ class ToolLoader:
             return None, None
 
     @staticmethod
-    def load_all_tools() -> List[Union[Dict[str, Any], Callable]]:
+    def load_all_tools_and_functions() -> Tuple[
+        List[Union[Dict[str, Any], Callable]], Dict[str, Callable]
+    ]:
         """
-        Load all available tools.
+        Load all available tools in a single pass over the tools directory.
 
         Returns:
-            List of tool definitions or function references
+            Tuple of (list of tool definitions or function references,
+            dictionary of function name to function reference)
         """
-        tool_names = ToolLoader.list_available_tools()
+        tool_files, definition_files = ToolLoader._scan_tools_dir()
         tools = []
+        function_map = {}
+
+        for name, py_mtime_ns in tool_files.items():
+            sanitized_name = _sanitize_tool_name(name)
+            if sanitized_name == name:
+                # The scan already told us which files exist
+                function, definition = ToolLoader._load_tool(
+                    name, name, py_mtime_ns, definition_files.get(name)
+                )
+            else:
+                function, definition = ToolLoader.load_tool_function(name)
 
-        for name in tool_names:
-            function, definition = ToolLoader.load_tool_function(name)
             if function:
                 # Return the function directly for the new tool calling style
                 tools.append(function)
+                function_map[function.__name__] = function
             elif definition:
                 # Fall back to definition if function couldn't be loaded
                 tools.append(definition)
 
+        return tools, function_map
+
+    @staticmethod
+    def load_all_tools() -> List[Union[Dict[str, Any], Callable]]:
+        """
+        Load all available tools.
+
+        Returns:
+            List of tool definitions or function references
+        """
+        tools, _ = ToolLoader.load_all_tools_and_functions()
         return tools
 
     @staticmethod
@@ -250,30 +345,27 @@ class ToolLoader:
         Returns:
             Dictionary of function name to function reference
         """
-        tool_names = ToolLoader.list_available_tools()
-        function_map = {}
-
-        for name in tool_names:
-            function, definition = ToolLoader.load_tool_function(name)
-            if function:
-                function_name = function.__name__
-                function_map[function_name] = function
-
+        _, function_map = ToolLoader.load_all_tools_and_functions()
         return function_map
 
     @staticmethod
-    def execute_tool(tool_name: str, args: Dict[str, Any]) -> Any:
+    def execute_tool(tool: Union[str, Callable], args: Dict[str, Any]) -> Any:
         """
         Execute a tool function with the given arguments.
 
         Args:
-            tool_name: Name of the tool
+            tool: Name of the tool, or the tool function itself if the caller
+                has already loaded it
             args: Arguments to pass to the tool function
 
         Returns:
             Result of the tool execution
         """
-        function, _ = ToolLoader.load_tool_function(tool_name)
+        if callable(tool):
+            function, tool_name = tool, tool.__name__
+        else:
+            tool_name = tool
+            function, _ = ToolLoader.load_tool_function(tool_name)
         if function:
             try:
                 result = function(**args)
@@ -1,14 +1,15 @@
-import streamlit as st
 import sys
 import os
 
-# Add the current directory to the Python path
+# Add the current directory to the Python path. Streamlit executes this
+# script again on every rerun, so only add it once
 current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, current_dir)
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
 
-# Import the main app
-from app.main import main
-
-# Run the app
+# Run the app. The app is only imported here, so importing this module
+# doesn't load it
 if __name__ == "__main__":
+    from app.main import main
+
     main()